@@ -16,11 +16,99 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import asyncio
+import codecs
+import collections
+import hashlib
+import io
+import json
+import logging
+import mmap
 import os
-import subprocess
+import pickle
+import shutil
+from importlib import metadata
 from pathlib import Path
 from typing import Dict, Optional, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+# Files written to work_root to track the configured EDAM
+EDAM_FILE = "edam.json"
+EDAM_HASH_FILE = ".edam.hash"
+FLOW_STATE_FILE = ".flow_state.pkl"
+BUILD_MANIFEST_FILE = ".build_manifest.json"
+
+# Build output is streamed to this file in work_root
+BUILD_LOG_FILE = "build.log"
+
+# Number of trailing output lines kept for error messages
+LOG_TAIL_LINES = 50
+
+# Build output is read in chunks of this size, and kept lines are cut
+# to LOG_LINE_LIMIT characters, so arbitrarily long lines are tolerated
+LOG_READ_SIZE = 64 * 1024
+LOG_LINE_LIMIT = 4096
+
+
+def _get_edalize_version() -> str:
+    """Get the installed Edalize version, used to key saved flow state"""
+    try:
+        return metadata.version('edalize')
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+_EDALIZE_VERSION = _get_edalize_version()
+
+
+def get_build_cache_dir() -> Path:
+    """
+    Get the root directory of the shared build-artifact cache.
+    
+    Returns:
+        Cache directory (honors XDG_CACHE_HOME)
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(cache_home) / 'dv-flow-libfusesoc'
+
+
+# Common log file patterns: by extension, and by exact name
+LOG_FILE_SUFFIXES = ('.log', '.rpt')
+LOG_FILE_NAMES = ('transcript',)
+
+
+def _scan_log_files(directory: Path) -> List[Path]:
+    """
+    Find log files in a directory with a single scandir pass.
+    
+    Args:
+        directory: Directory to scan
+        
+    Returns:
+        Log file paths, ordered by suffix (.log, .rpt), then name
+    """
+    found = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name in LOG_FILE_NAMES:
+                rank = len(LOG_FILE_SUFFIXES)
+            elif name.endswith(LOG_FILE_SUFFIXES) and not name.startswith('.'):
+                rank = LOG_FILE_SUFFIXES.index(os.path.splitext(name)[1])
+            else:
+                continue
+            if entry.is_file(follow_symlinks=False):
+                found.append((rank, name, Path(entry.path)))
+                
+    return [path for _, _, path in sorted(found)]
+
 
 class EdalizeBackend:
     """
@@ -43,6 +131,15 @@ class EdalizeBackend:
         self.work_root = Path(work_root)
         self.verbose = verbose
         self.flow = None
+        self._edam_data = None
+        
+        # Build artifact locations, checked on every status query
+        name = edam.get('name')
+        toplevel = edam.get('toplevel')
+        self._simv_path = str(self.work_root / 'simv')
+        self._design_path = str(self.work_root / name) if name else None
+        self._objdir_path = str(self.work_root / 'obj_dir')
+        self._vtop_path = str(self.work_root / f'V{toplevel}') if toplevel else None
         
         # Create work directory
         self.work_root.mkdir(parents=True, exist_ok=True)
@@ -51,10 +148,33 @@ class EdalizeBackend:
         """
         Configure the flow (setup files, generate scripts).
         
+        If the work directory was already configured from an identical
+        EDAM, and no source file changed since, configure is not re-run.
+        This keeps Edalize from rewriting its scripts and forcing a full
+        rebuild downstream. The flow object itself is restored from the
+        state saved by the configuring task when possible.
+        
         Returns:
             True if successful, False otherwise
         """
         try:
+            # Snapshot before instantiating the flow, since Edalize
+            # rearranges the EDAM it is given
+            edam_data = self._serialize_edam()
+            self._edam_data = edam_data
+            digest = self._digest(edam_data)
+            up_to_date = self._is_configured(digest)
+            
+            if up_to_date:
+                self.flow = self._load_flow_state(digest)
+                if self.flow is not None:
+                    return True
+                    
+                # State saved by another Edalize version, or unreadable,
+                # may come with stale scripts too, so configure again
+                if (self.work_root / FLOW_STATE_FILE).exists():
+                    up_to_date = False
+            
             # Instantiate the flow
             self.flow = self.flow_class(
                 edam=self.edam,
@@ -62,16 +182,20 @@ class EdalizeBackend:
                 verbose=self.verbose
             )
             
-            # Configure the flow
-            self.flow.configure()
+            if not up_to_date:
+                self._clear_edam_hash()
+                
+                # Configure the flow
+                self.flow.configure()
+                
+                self._write_edam_hash(edam_data, digest)
+                
+            self._save_flow_state(digest)
             
             return True
             
         except Exception as e:
-            print(f"Configuration failed: {e}")
-            if self.verbose:
-                import traceback
-                traceback.print_exc()
+            logger.error("Configuration failed: %s", e, exc_info=self.verbose)
             return False
             
     def build(self, args: Optional[List[str]] = None) -> tuple[bool, str]:
@@ -93,16 +217,132 @@ class EdalizeBackend:
             
             # Check for build artifacts
             build_success = self._check_build_success()
+            if build_success:
+                self._write_build_manifest()
             
             return build_success, "Build completed"
             
         except Exception as e:
             error_msg = f"Build failed: {e}"
-            if self.verbose:
-                import traceback
-                traceback.print_exc()
+            logger.error(error_msg, exc_info=self.verbose)
             return False, error_msg
             
+    async def build_async(self) -> tuple[bool, str]:
+        """
+        Build the design without blocking the event loop.
+        
+        The flow's build command (make, by default) is launched as a
+        subprocess, with -j set to the CPU count for make, so several
+        designs can build concurrently.
+        
+        Returns:
+            Tuple of (success, output)
+        """
+        if not self.flow:
+            return False, "Flow not configured. Call configure() first."
+            
+        try:
+            build_runner = getattr(self.flow, 'build_runner', None)
+            
+            if build_runner is None:
+                # Flow drives its own build; keep it off the event loop
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.flow.build)
+            else:
+                cmd, args = build_runner.get_build_command()
+                args = list(args)
+                if cmd == 'make':
+                    args = ['-j', str(os.cpu_count() or 1)] + args
+                    
+                proc = await asyncio.create_subprocess_exec(
+                    cmd, *args,
+                    cwd=str(self.work_root),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT
+                )
+                try:
+                    tail = await self._stream_output(proc, self.work_root / BUILD_LOG_FILE)
+                    returncode = await proc.wait()
+                finally:
+                    # Don't leave the build running if streaming failed or
+                    # the task was cancelled
+                    if proc.returncode is None:
+                        proc.kill()
+                        await proc.wait()
+                
+                if returncode != 0:
+                    error_msg = f"Build failed: '{cmd}' exited with an error: {returncode}"
+                    if tail:
+                        error_msg += "\n" + "\n".join(tail)
+                    return False, error_msg
+            
+            # Check for build artifacts
+            build_success = self._check_build_success()
+            if build_success:
+                self._write_build_manifest()
+            
+            return build_success, "Build completed"
+            
+        except Exception as e:
+            error_msg = f"Build failed: {e}"
+            logger.error(error_msg, exc_info=self.verbose)
+            return False, error_msg
+            
+    async def _stream_output(self, proc, log_file: Path) -> List[str]:
+        """
+        Stream subprocess output to a log file.
+        
+        Output is never held in memory as a whole; only the last
+        LOG_TAIL_LINES lines, each cut to LOG_LINE_LIMIT characters,
+        are kept for error reporting. The log receives the full output.
+        
+        Args:
+            proc: Subprocess with stdout piped
+            log_file: File to write the output to
+            
+        Returns:
+            The last lines of output
+        """
+        tail = collections.deque(maxlen=LOG_TAIL_LINES)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        partial = ''
+        
+        def add_line(line: str):
+            line = line[:LOG_LINE_LIMIT]
+            tail.append(line)
+            if self.verbose:
+                logger.info(line)
+        
+        with open(log_file, 'w') as log:
+            while True:
+                chunk = await proc.stdout.read(LOG_READ_SIZE)
+                text = decoder.decode(chunk, final=not chunk)
+                log.write(text)
+                
+                lines = (partial + text).split('\n')
+                partial = lines.pop()[:LOG_LINE_LIMIT]
+                for line in lines:
+                    add_line(line)
+                    
+                if not chunk:
+                    break
+                    
+        if partial:
+            add_line(partial)
+            
+        return list(tail)
+        
+    async def run_async(self) -> tuple[bool, str]:
+        """
+        Run the design without blocking the event loop.
+        
+        Returns:
+            Tuple of (success, output)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.run)
+            
     def run(self, args: Optional[List[str]] = None) -> tuple[bool, str]:
         """
         Run the design (simulate, program FPGA, etc.).
@@ -127,11 +367,124 @@ class EdalizeBackend:
             
         except Exception as e:
             error_msg = f"Run failed: {e}"
-            if self.verbose:
-                import traceback
-                traceback.print_exc()
+            logger.error(error_msg, exc_info=self.verbose)
             return False, error_msg
             
+    def is_configured(self) -> bool:
+        """
+        Check whether work_root is configured for the current EDAM.
+        
+        Returns:
+            True if the recorded EDAM hash matches and sources are unchanged
+        """
+        return self._is_configured(self._digest(self._serialize_edam()))
+        
+    def _serialize_edam(self) -> str:
+        """Serialize the EDAM (files, flow and tool options) canonically"""
+        if orjson is not None:
+            return orjson.dumps(
+                self.edam,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                default=str
+            ).decode()
+        return json.dumps(self.edam, sort_keys=True, separators=(',', ':'), default=str)
+        
+    def _digest(self, edam_data: str) -> str:
+        """Compute a stable hash of serialized EDAM data"""
+        return hashlib.blake2b(edam_data.encode(), digest_size=16).hexdigest()
+        
+    def _is_configured(self, digest: str) -> bool:
+        """
+        Check a digest against the one recorded by the last configure.
+        
+        Args:
+            digest: EDAM digest from _digest()
+            
+        Returns:
+            True if the digest matches and no source file is newer than it
+        """
+        hash_file = self.work_root / EDAM_HASH_FILE
+        try:
+            if hash_file.read_text().strip() != digest:
+                return False
+            hash_mtime = hash_file.stat().st_mtime
+        except OSError:
+            return False
+            
+        for file_info in self.edam.get('files', []):
+            # EDAM file paths are relative to work_root
+            path = os.path.join(self.work_root, file_info['name'])
+            try:
+                if os.stat(path).st_mtime > hash_mtime:
+                    return False
+            except OSError:
+                return False
+                
+        return True
+        
+    def _write_edam_hash(self, edam_data: str, digest: str):
+        """Record the EDAM and its digest after a successful configure"""
+        (self.work_root / EDAM_FILE).write_text(edam_data)
+        (self.work_root / EDAM_HASH_FILE).write_text(digest)
+        
+    def _clear_edam_hash(self):
+        """Invalidate the recorded digest before re-configuring"""
+        for name in (EDAM_HASH_FILE, FLOW_STATE_FILE, BUILD_MANIFEST_FILE):
+            path = self.work_root / name
+            if path.exists():
+                path.unlink()
+                
+    def _save_flow_state(self, digest: str):
+        """
+        Save the configured flow's state for reuse by later tasks.
+        
+        Open file handles are not saved. The state is keyed on the flow
+        class and Edalize version as well as the EDAM digest, so it is
+        never restored into a different flow implementation. If the state
+        cannot be pickled, no state file is left behind and later tasks
+        re-instantiate.
+        
+        Args:
+            digest: EDAM digest the flow was configured from
+        """
+        state = {k: (None if isinstance(v, io.IOBase) else v)
+                 for k, v in self.flow.__dict__.items()}
+        state_file = self.work_root / FLOW_STATE_FILE
+        try:
+            with open(state_file, 'wb') as f:
+                pickle.dump((digest, self._flow_state_key(), state), f)
+        except Exception:
+            if state_file.exists():
+                state_file.unlink()
+                
+    def _load_flow_state(self, digest: str):
+        """
+        Restore a flow from saved state without re-instantiating it.
+        
+        Args:
+            digest: EDAM digest the state must have been saved for
+            
+        Returns:
+            Flow instance, or None if no usable state was saved
+        """
+        try:
+            with open(self.work_root / FLOW_STATE_FILE, 'rb') as f:
+                saved_digest, saved_key, state = pickle.load(f)
+        except Exception:
+            return None
+            
+        if saved_digest != digest or saved_key != self._flow_state_key():
+            return None
+            
+        flow = self.flow_class.__new__(self.flow_class)
+        flow.__dict__.update(state)
+        return flow
+        
+    def _flow_state_key(self) -> str:
+        """Identify the flow implementation that saved state belongs to"""
+        cls = self.flow_class
+        return f"{cls.__module__}.{cls.__qualname__}/{_EDALIZE_VERSION}"
+        
     def get_tool(self) -> Optional[str]:
         """Get the tool name being used."""
         if self.flow:
@@ -142,6 +495,184 @@ class EdalizeBackend:
         """Get the work directory path."""
         return self.work_root
         
+    def find_build_artifact(self) -> Optional[Path]:
+        """
+        Find the primary artifact produced by the build.
+        
+        Returns:
+            Path to the simulation executable/model, or None if not found
+        """
+        tool = self.edam.get('flow_options', {}).get('tool')
+        
+        if tool == 'icarus':
+            # Icarus creates simv, a .vvp file, or a file named after the design
+            if os.path.isfile(self._simv_path):
+                return Path(self._simv_path)
+            vvp_files = self._glob(self.work_root, '*.vvp')
+            if vvp_files:
+                return min(vvp_files)
+            if self._design_path and os.path.isfile(self._design_path):
+                return Path(self._design_path)
+                    
+        elif tool == 'verilator':
+            # Verilator creates V<toplevel>, either in obj_dir or work_root
+            if os.path.isdir(self._objdir_path):
+                if self._glob(Path(self._objdir_path), 'V*'):
+                    return Path(self._objdir_path)
+            if self._vtop_path and os.path.isfile(self._vtop_path):
+                return Path(self._vtop_path)
+                
+        return None
+        
+    def build_cache_key(self) -> str:
+        """
+        Compute a content-addressed key for the build.
+        
+        The key covers the EDAM (toplevel, parameters, tool options) and
+        the content of every source file it references.
+        
+        Returns:
+            Hex digest identifying the build inputs
+        """
+        h = hashlib.sha256()
+        h.update((self._edam_data or self._serialize_edam()).encode())
+        
+        # All files feed one hash stream. Each is prefixed with its name
+        # and size so that file boundaries are unambiguous.
+        for name in sorted(f['name'] for f in self.edam.get('files', [])):
+            path = os.path.join(self.work_root, name)
+            try:
+                with open(path, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    h.update(f"\0{len(name)}:{name}:{size}:".encode())
+                    if size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                            h.update(m)
+            except OSError:
+                # Missing inputs still contribute their name to the key
+                h.update(f"\0{len(name)}:{name}:-:".encode())
+                
+        return h.hexdigest()
+        
+    def _build_cache_entry(self) -> Optional[Path]:
+        """Get the cache directory for the current build, if cacheable"""
+        tool = self.edam.get('flow_options', {}).get('tool')
+        if not tool:
+            return None
+        return get_build_cache_dir() / tool / self.build_cache_key()
+        
+    def restore_cached_build(self) -> bool:
+        """
+        Restore build artifacts from the cache, if present.
+        
+        Restored files get the current time as their mtime, not the time
+        they were cached, so they are newer than the scripts configure()
+        just wrote and the tool's Makefile does not rebuild them.
+        
+        Returns:
+            True if the artifact was restored into work_root
+        """
+        entry = self._build_cache_entry()
+        if entry is None or not entry.is_dir():
+            return False
+            
+        try:
+            for src in entry.iterdir():
+                dst = self.work_root / src.name
+                if src.is_dir():
+                    shutil.copytree(src, dst, copy_function=shutil.copy, dirs_exist_ok=True)
+                    # copytree still copies directory times
+                    for root, _, _ in os.walk(dst):
+                        os.utime(root)
+                else:
+                    shutil.copy(src, dst)
+        except OSError:
+            return False
+            
+        if not self._check_build_success():
+            return False
+            
+        self._write_build_manifest()
+        return True
+        
+    def store_cached_build(self) -> bool:
+        """
+        Store the build artifact in the cache for reuse on unchanged inputs.
+        
+        Returns:
+            True if the artifact was stored
+        """
+        artifact = self.find_build_artifact()
+        entry = self._build_cache_entry()
+        if artifact is None or entry is None:
+            return False
+        if entry.is_dir():
+            return True
+            
+        # Populate a temporary directory, then move it into place so
+        # concurrent builds never observe a partial entry
+        tmp_entry = entry.parent / f'.{entry.name}.{os.getpid()}'
+        try:
+            tmp_entry.mkdir(parents=True, exist_ok=True)
+            if artifact.is_dir():
+                shutil.copytree(artifact, tmp_entry / artifact.name)
+            else:
+                shutil.copy2(artifact, tmp_entry / artifact.name)
+            os.rename(tmp_entry, entry)
+        except OSError:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return entry.is_dir()
+            
+        return True
+        
+    def is_build_up_to_date(self) -> bool:
+        """
+        Check whether the last build is still valid.
+        
+        The build is up to date if it was done for the current EDAM, its
+        artifact still exists, and every source file has the size and
+        mtime recorded when it was built.
+        
+        Returns:
+            True if building again would not change anything
+        """
+        try:
+            with open(self.work_root / BUILD_MANIFEST_FILE) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+            
+        edam_data = self._edam_data or self._serialize_edam()
+        if manifest.get('edam') != self._digest(edam_data):
+            return False
+            
+        if manifest.get('files') != self._file_fingerprints():
+            return False
+            
+        return self.find_build_artifact() is not None
+        
+    def _file_fingerprints(self) -> Dict[str, List[int]]:
+        """Get (size, mtime_ns) for every EDAM source file"""
+        fingerprints = {}
+        for file_info in self.edam.get('files', []):
+            name = file_info['name']
+            try:
+                st = os.stat(os.path.join(self.work_root, name))
+                fingerprints[name] = [st.st_size, st.st_mtime_ns]
+            except OSError:
+                fingerprints[name] = None
+        return fingerprints
+        
+    def _write_build_manifest(self):
+        """Record the inputs of a successful build"""
+        edam_data = self._edam_data or self._serialize_edam()
+        manifest = {
+            'edam': self._digest(edam_data),
+            'files': self._file_fingerprints(),
+        }
+        with open(self.work_root / BUILD_MANIFEST_FILE, 'w') as f:
+            json.dump(manifest, f)
+            
     def _check_build_success(self) -> bool:
         """
         Check if build was successful by looking for expected artifacts.
@@ -152,18 +683,8 @@ class EdalizeBackend:
         # For simulation, check for executable/model
         tool = self.get_tool()
         
-        if tool == 'icarus':
-            # Icarus creates simv or <toplevel> executable
-            return (self.work_root / 'simv').exists() or \
-                   any(self.work_root.glob('*.vvp'))
-                   
-        elif tool == 'verilator':
-            # Verilator creates obj_dir with V<toplevel> executable
-            obj_dirs = list(self.work_root.glob('obj_dir'))
-            if obj_dirs:
-                executables = list(obj_dirs[0].glob('V*'))
-                return len(executables) > 0
-            return False
+        if tool in ('icarus', 'verilator'):
+            return self.find_build_artifact() is not None
             
         # Default: assume success if no exception was raised
         return True
@@ -183,6 +704,30 @@ class EdalizeBackend:
         # For now, assume success if no exception
         return True
         
+    def _glob(self, directory: Path, pattern: str) -> List[Path]:
+        """
+        List the entries of a directory that match a pattern.
+        
+        Args:
+            directory: Directory to search (not recursive)
+            pattern: Glob pattern
+            
+        Returns:
+            List of matching paths (empty if the directory does not exist)
+        """
+        suffix = pattern[1:]
+        if pattern.startswith('*') and not any(c in suffix for c in '*?['):
+            # Simple suffix match: a single scandir, no per-entry stat.
+            # Like glob, '*' does not match hidden entries.
+            try:
+                with os.scandir(directory) as it:
+                    return [Path(e.path) for e in it
+                            if e.name.endswith(suffix) and not e.name.startswith('.')]
+            except OSError:
+                return []
+                
+        return list(directory.glob(pattern))
+        
     def get_log_files(self) -> List[Path]:
         """
         Get list of log files generated during build/run.
@@ -190,23 +735,40 @@ class EdalizeBackend:
         Returns:
             List of log file paths
         """
-        log_files = []
-        
-        # Common log file patterns
-        patterns = ['*.log', '*.rpt', 'transcript']
-        
-        for pattern in patterns:
-            log_files.extend(self.work_root.glob(pattern))
-            
-        return log_files
+        try:
+            return _scan_log_files(self.work_root)
+        except OSError:
+            return []
         
     def cleanup(self):
         """Clean up work directory."""
-        import shutil
         if self.work_root.exists():
             shutil.rmtree(self.work_root)
 
 
+# Edalize flow classes, imported on first use
+_SIM_FLOW_CLASS = None
+_VIVADO_FLOW_CLASS = None
+
+
+def _get_sim():
+    """Get the Edalize simulation flow class, importing it on first use"""
+    global _SIM_FLOW_CLASS
+    if _SIM_FLOW_CLASS is None:
+        from edalize.flows.sim import Sim
+        _SIM_FLOW_CLASS = Sim
+    return _SIM_FLOW_CLASS
+
+
+def _get_vivado():
+    """Get the Edalize Vivado flow class, importing it on first use"""
+    global _VIVADO_FLOW_CLASS
+    if _VIVADO_FLOW_CLASS is None:
+        from edalize.flows.vivado import Vivado
+        _VIVADO_FLOW_CLASS = Vivado
+    return _VIVADO_FLOW_CLASS
+
+
 def create_sim_backend(edam: Dict, work_root: Path, verbose: bool = False) -> EdalizeBackend:
     """
     Convenience function to create a simulation backend.
@@ -219,8 +781,7 @@ def create_sim_backend(edam: Dict, work_root: Path, verbose: bool = False) -> Ed
     Returns:
         EdalizeBackend instance configured for simulation
     """
-    from edalize.flows.sim import Sim
-    return EdalizeBackend(Sim, edam, work_root, verbose)
+    return EdalizeBackend(_get_sim(), edam, work_root, verbose)
 
 
 def create_fpga_backend(edam: Dict, work_root: Path, verbose: bool = False) -> EdalizeBackend:
@@ -235,5 +796,4 @@ def create_fpga_backend(edam: Dict, work_root: Path, verbose: bool = False) -> E
     Returns:
         EdalizeBackend instance configured for FPGA synthesis
     """
-    from edalize.flows.vivado import Vivado
-    return EdalizeBackend(Vivado, edam, work_root, verbose)
+    return EdalizeBackend(_get_vivado(), edam, work_root, verbose)
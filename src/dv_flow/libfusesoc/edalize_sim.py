@@ -16,13 +16,19 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import json
 from pathlib import Path
 from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 from dv_flow.mgr.task_data import TaskDataInput, TaskDataResult, TaskMarker, SeverityE
 
 from .edam_builder import EdamBuilder
-from .edalize_backend import create_sim_backend
+from .edalize_backend import create_sim_backend, EDAM_FILE
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class SimConfigureParams(BaseModel):
@@ -63,6 +69,12 @@ class SimBuildParams(BaseModel):
     """
     work_root: str = Field(description="Edalize work directory")
     tool: str = Field(description="Simulation tool")
+    
+    # Caching
+    use_cache: bool = Field(
+        default=True,
+        description="Restore and store build artifacts in the per-user cache "
+                    "($XDG_CACHE_HOME/dv-flow-libfusesoc, default ~/.cache) for unchanged inputs")
 
 
 class SimBuildOutput(BaseModel):
@@ -94,6 +106,32 @@ class SimRunOutput(BaseModel):
     log_file: Optional[str] = Field(default=None, description="Path to simulation log")
 
 
+def _load_edam(work_root: Path, tool: str) -> Dict:
+    """
+    Load the EDAM recorded in a configured work directory.
+    
+    Args:
+        work_root: Edalize work directory
+        tool: Simulation tool
+        
+    Returns:
+        EDAM dictionary, or an empty dictionary if none was recorded
+    """
+    edam_file = work_root / f"{tool}.edam"
+    if not edam_file.exists():
+        # Try the file written by EdalizeBackend.configure()
+        edam_file = work_root / EDAM_FILE
+    
+    if edam_file.exists():
+        with open(edam_file, 'rb') as f:
+            data = f.read()
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    return {}
+
+
 async def SimConfigure(runner, input: TaskDataInput[SimConfigureParams]) -> TaskDataResult:
     """
     Configure a simulation using Edalize.
@@ -151,7 +189,7 @@ async def SimConfigure(runner, input: TaskDataInput[SimConfigureParams]) -> Task
                 msg=f"Failed to configure {params.tool} simulation"
             ))
         
-        output = SimConfigureOutput(
+        output = SimConfigureOutput.model_construct(
             work_root=str(work_root),
             tool=params.tool,
             configured=success
@@ -198,34 +236,33 @@ async def SimBuild(runner, input: TaskDataInput[SimBuildParams]) -> TaskDataResu
         work_root = Path(params.work_root)
         
         # Re-create backend (flow was already configured)
-        # We need to load the EDAM from the work directory
-        from edalize.flows.sim import Sim
-        from .edalize_backend import EdalizeBackend
-        
-        # For now, we'll read the EDAM from the work directory
-        # Edalize stores it in work_root
-        import json
-        edam_file = work_root / f"{params.tool}.edam"
-        if not edam_file.exists():
-            # Try without tool prefix
-            edam_file = work_root / "edam.json"
-        
-        if edam_file.exists():
-            with open(edam_file) as f:
-                edam = json.load(f)
-        else:
-            # Backend will reinitialize from existing files
-            edam = {}
+        # Read the EDAM recorded in work_root by SimConfigure
+        edam = _load_edam(work_root, params.tool)
         
-        backend = EdalizeBackend(Sim, edam, work_root, verbose=True)
+        backend = create_sim_backend(edam, work_root, verbose=True)
         
-        # Build
-        build_success, build_msg = backend.build()
+        # Re-attach to the configured flow. Configure is skipped when
+        # the EDAM and its sources are unchanged since SimConfigure
+        cached = False
+        if not backend.configure():
+            build_success, build_msg = False, "Flow could not be configured"
+        elif backend.is_build_up_to_date():
+            # No source changed since the last build in this work_root
+            cached = True
+            build_success, build_msg = True, "Build is up to date"
+        elif params.use_cache and backend.restore_cached_build():
+            # Inputs are unchanged since a previous build
+            cached = True
+            build_success, build_msg = True, "Build restored from cache"
+        else:
+            build_success, build_msg = await backend.build_async()
+            if build_success and params.use_cache:
+                backend.store_cached_build()
         
         if build_success:
             markers.append(TaskMarker(
                 severity=SeverityE.Info,
-                msg=f"Build completed successfully"
+                msg=build_msg if cached else "Build completed successfully"
             ))
         else:
             markers.append(TaskMarker(
@@ -233,10 +270,12 @@ async def SimBuild(runner, input: TaskDataInput[SimBuildParams]) -> TaskDataResu
                 msg=f"Build failed: {build_msg}"
             ))
         
-        output = SimBuildOutput(
+        executable = backend.find_build_artifact() if build_success else None
+        
+        output = SimBuildOutput.model_construct(
             work_root=str(work_root),
             build_success=build_success,
-            executable=None  # TODO: Determine executable path
+            executable=str(executable) if executable else None
         )
         
         return TaskDataResult(
@@ -280,13 +319,15 @@ async def SimRun(runner, input: TaskDataInput[SimRunParams]) -> TaskDataResult:
         work_root = Path(params.work_root)
         
         # Re-create backend
-        from edalize.flows.sim import Sim
-        from .edalize_backend import EdalizeBackend
+        edam = _load_edam(work_root, params.tool)
         
-        backend = EdalizeBackend(Sim, {}, work_root, verbose=True)
+        backend = create_sim_backend(edam, work_root, verbose=True)
         
         # Run
-        run_success, run_msg = backend.run()
+        if backend.configure():
+            run_success, run_msg = await backend.run_async()
+        else:
+            run_success, run_msg = False, "Flow could not be configured"
         
         if run_success:
             markers.append(TaskMarker(
@@ -303,7 +344,7 @@ async def SimRun(runner, input: TaskDataInput[SimRunParams]) -> TaskDataResult:
         log_files = backend.get_log_files()
         log_file = str(log_files[0]) if log_files else None
         
-        output = SimRunOutput(
+        output = SimRunOutput.model_construct(
             work_root=str(work_root),
             run_success=run_success,
             log_file=log_file
@@ -16,10 +16,59 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import shutil
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 
+# Map DV Flow file types to EDAM file types
+_FILE_TYPE_MAP = {
+    'verilog': 'verilogSource',
+    'systemverilog': 'systemVerilogSource',
+    'vhdl': 'vhdlSource',
+    'vhdl-2008': 'vhdlSource-2008',
+    'constraint': 'user',  # Will need more specific mapping based on tool
+    'xdc': 'xdc',
+    'sdc': 'SDC',
+    'ucf': 'UCF',
+    'tcl': 'tclSource',
+    'user': 'user',
+}
+
+# Map exact Python types to EDAM parameter datatypes
+_DATATYPE_MAP = {
+    bool: 'bool',
+    int: 'int',
+    float: 'real',
+    str: 'str',
+}
+
+
+def _as_str(value: Any) -> str:
+    """Convert a path-like value to str, skipping the call for str values"""
+    return value if type(value) is str else str(value)
+
+
+# Compiler/linker accelerators found on PATH (detected once per process)
+_ACCELERATORS: Optional[Dict[str, Optional[str]]] = None
+
+
+def _autodetect_accelerators() -> Dict[str, Optional[str]]:
+    """
+    Detect ccache and mold on PATH.
+    
+    Returns:
+        Dictionary mapping accelerator name to its path (None if absent)
+    """
+    global _ACCELERATORS
+    if _ACCELERATORS is None:
+        _ACCELERATORS = {
+            'ccache': shutil.which('ccache'),
+            'mold': shutil.which('mold'),
+        }
+    return _ACCELERATORS
+
+
 class EdamBuilder:
     """
     Builds EDAM (EDA Metadata) structures for Edalize.
@@ -28,13 +77,15 @@ class EdamBuilder:
     needed for EDA tool operations (simulation, synthesis, etc.).
     """
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, accelerate: bool = True):
         """
         Initialize EDAM builder.
         
         Args:
             name: Project/design name
+            accelerate: Use ccache/mold for Verilator builds when available
         """
+        self.accelerate = accelerate
         self.edam = {
             'name': name,
             'files': [],
@@ -44,33 +95,56 @@ class EdamBuilder:
             'toplevel': [],
         }
         
+        # (name, file_type, logical_name) of files already added
+        self._seen_files = set()
+        
+        # Include directories, turned into tool options by build()
+        self._include_dirs: List[str] = []
+        
     def add_files(self, files: List[Dict]) -> 'EdamBuilder':
         """
         Add files to EDAM.
         
+        Files already added (same name, type and library) are skipped,
+        keeping the first occurrence to preserve compile order.
+        
         Args:
             files: List of file dictionaries with 'name' and 'file_type'
             
         Returns:
             Self for chaining
         """
+        # Bind hot names locally; this loop runs once per file in the core
+        type_map_get = _FILE_TYPE_MAP.get
+        append = self.edam['files'].append
+        seen = self._seen_files
+        
         for file_info in files:
+            get = file_info.get
+            path = get('path')
             edam_file = {
-                'name': str(file_info.get('path', file_info.get('name'))),
-                'file_type': self._map_file_type(file_info.get('type', 'user')),
+                'name': _as_str(path if path is not None else get('name')),
+                'file_type': type_map_get(get('type', 'user'), 'user'),
             }
             
             # Add optional attributes
-            if file_info.get('is_include'):
+            if get('is_include'):
                 edam_file['is_include_file'] = True
                 
-            if file_info.get('include_path'):
-                edam_file['include_path'] = str(file_info['include_path'])
+            include_path = get('include_path')
+            if include_path:
+                edam_file['include_path'] = _as_str(include_path)
                 
-            if file_info.get('library'):
-                edam_file['logical_name'] = file_info['library']
+            library = get('library')
+            if library:
+                edam_file['logical_name'] = library
                 
-            self.edam['files'].append(edam_file)
+            key = (edam_file['name'], edam_file['file_type'], library or '')
+            if key in seen:
+                continue
+            seen.add(key)
+                
+            append(edam_file)
             
         return self
         
@@ -165,31 +239,40 @@ class EdamBuilder:
         """
         Add include directories (convenience method).
         
+        The tool flags are generated by build(), once the target tool
+        is known, so that options are only emitted for that tool.
+        
         Args:
             include_dirs: List of include directory paths
             
         Returns:
             Self for chaining
         """
-        # Edalize handles include dirs via tool options
-        # For Icarus and Verilator, we need to add them to appropriate tool options
-        for tool in ['icarus', 'verilator']:
-            if tool not in self.edam['tool_options']:
-                self.edam['tool_options'][tool] = {}
+        self._include_dirs.extend(str(inc_dir) for inc_dir in include_dirs)
+        return self
+        
+    def _apply_include_dirs(self):
+        """Add pending include directories to the target tool's options"""
+        if not self._include_dirs:
+            return
+            
+        # Edalize handles include dirs via tool options. Only the target
+        # tool is populated; without one, Icarus and Verilator both are.
+        tool = self.edam['flow_options'].get('tool')
+        tools = [tool] if tool in ('icarus', 'verilator') else ['icarus', 'verilator']
+        
+        for tool in tools:
+            options = self.edam['tool_options'].setdefault(tool, {})
                 
             if tool == 'icarus':
-                if 'iverilog_options' not in self.edam['tool_options'][tool]:
-                    self.edam['tool_options'][tool]['iverilog_options'] = []
-                for inc_dir in include_dirs:
-                    self.edam['tool_options'][tool]['iverilog_options'].extend(['-I', str(inc_dir)])
+                options.setdefault('iverilog_options', []).extend(
+                    [flag for inc_dir in self._include_dirs for flag in ('-I', inc_dir)])
                     
             elif tool == 'verilator':
-                if 'verilator_options' not in self.edam['tool_options'][tool]:
-                    self.edam['tool_options'][tool]['verilator_options'] = []
-                for inc_dir in include_dirs:
-                    self.edam['tool_options'][tool]['verilator_options'].append(f'-I{inc_dir}')
+                options.setdefault('verilator_options', []).extend(
+                    [f'-I{inc_dir}' for inc_dir in self._include_dirs])
                     
-        return self
+        self._include_dirs = []
         
     def build(self) -> Dict:
         """
@@ -202,26 +285,47 @@ class EdamBuilder:
         if not self.edam.get('name'):
             raise ValueError("EDAM 'name' is required")
             
+        self._apply_include_dirs()
+            
+        if self.accelerate and self.edam['flow_options'].get('tool') == 'verilator':
+            self._add_verilator_accelerators()
+            
         return self.edam
         
+    def _add_verilator_accelerators(self):
+        """
+        Wire ccache and mold into the Verilator C++ build, if available.
+        
+        The Verilator-generated makefile picks up a compiler cache via
+        OBJCACHE and extra linker flags via -LDFLAGS.
+        """
+        accelerators = _autodetect_accelerators()
+        options = self.edam['tool_options'].setdefault('verilator', {})
+        make_options = options.setdefault('make_options', [])
+        verilator_options = options.setdefault('verilator_options', [])
+        
+        if not any(o.startswith('VM_PARALLEL_BUILDS=') for o in make_options):
+            make_options.append('VM_PARALLEL_BUILDS=1')
+            
+        if accelerators['ccache'] and \
+                not any(o.startswith('OBJCACHE=') for o in make_options):
+            make_options.append(f"OBJCACHE={accelerators['ccache']}")
+            
+        mold_flag = '-LDFLAGS -fuse-ld=mold'
+        if accelerators['mold'] and mold_flag not in verilator_options:
+            verilator_options.append(mold_flag)
+        
     def _map_file_type(self, dv_flow_type: str) -> str:
         """Map DV Flow file type to EDAM file type."""
-        type_map = {
-            'verilog': 'verilogSource',
-            'systemverilog': 'systemVerilogSource',
-            'vhdl': 'vhdlSource',
-            'vhdl-2008': 'vhdlSource-2008',
-            'constraint': 'user',  # Will need more specific mapping based on tool
-            'xdc': 'xdc',
-            'sdc': 'SDC',
-            'ucf': 'UCF',
-            'tcl': 'tclSource',
-            'user': 'user',
-        }
-        return type_map.get(dv_flow_type, 'user')
+        return _FILE_TYPE_MAP.get(dv_flow_type, 'user')
         
     def _infer_datatype(self, value: Any) -> str:
         """Infer EDAM datatype from Python value."""
+        datatype = _DATATYPE_MAP.get(type(value))
+        if datatype is not None:
+            return datatype
+            
+        # Subclasses (e.g., IntEnum); bool must be checked before int
         if isinstance(value, bool):
             return 'bool'
         elif isinstance(value, int):
@@ -16,13 +16,15 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import hashlib
 import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
 from dv_flow.mgr.task_data import TaskDataInput, TaskDataResult, TaskMarker, SeverityE
 
-from .fusesoc_manager import FuseSoCManager
+from .fusesoc_manager import get_manager
 from .fusesoc_fileset import FilesetConverter
 
 
@@ -31,6 +33,9 @@ class CoreResolveParams(BaseModel):
     Parameters for CoreResolve task.
     
     Resolves a FuseSoC core and extracts file lists.
+    
+    Parameters that were already validated when the flow graph was built
+    can be wrapped with from_trusted(), which skips re-validation.
     """
     # Core identification
     core: str = Field(description="Core VLNV (vendor:library:name:version)")
@@ -44,6 +49,19 @@ class CoreResolveParams(BaseModel):
     
     # Workspace configuration
     workspace: Optional[str] = Field(default=None, description="FuseSoC workspace directory")
+    
+    @classmethod
+    def from_trusted(cls, raw: Dict) -> "CoreResolveParams":
+        """
+        Build parameters from already-validated values without validation.
+        
+        Args:
+            raw: Parameter values keyed by field name
+            
+        Returns:
+            CoreResolveParams instance, with defaults for missing fields
+        """
+        return cls.model_construct(**raw)
 
 
 class CoreResolveOutput(BaseModel):
@@ -70,10 +88,70 @@ class CoreResolveMemento(BaseModel):
     core: str
     target: Optional[str]
     tool: Optional[str]
+    libraries: Dict[str, str] = Field(default_factory=dict)
     core_name: str
+    core_file: Optional[str] = None
+    fingerprint: str = ""  # Digest of core and source file names/sizes/mtimes
+    output: Dict = Field(default_factory=dict)  # CoreResolveOutput fields
     last_resolution: float  # Timestamp
 
 
+def _fingerprint(core_file: Optional[str], files: List[Dict]) -> str:
+    """
+    Digest the core file and sources by name, size and mtime.
+    
+    Args:
+        core_file: Path to the .core file, if known
+        files: Converted file list
+        
+    Returns:
+        Hex digest identifying the current state of the files
+    """
+    h = hashlib.blake2b(digest_size=16)
+    paths = [f['path'] for f in files]
+    if core_file:
+        paths.append(core_file)
+        
+    for path in sorted(paths):
+        try:
+            st = os.stat(path)
+            h.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+        except OSError:
+            h.update(f"{path}\0-\0".encode())
+            
+    return h.hexdigest()
+
+
+def _check_memento(input: TaskDataInput, params: CoreResolveParams) -> Tuple[Optional[Dict], bool]:
+    """
+    Check the previous memento against the parameters and the filesystem.
+    
+    Args:
+        input: Task input holding the previous memento
+        params: Current task parameters
+        
+    Returns:
+        Tuple of (memento if its resolution is still valid, whether the
+        core or source files it recorded changed since)
+    """
+    memento = input.memento
+    if not isinstance(memento, dict) or 'output' not in memento:
+        return None, False
+        
+    output = memento['output']
+    if _fingerprint(memento.get('core_file'), output.get('files', [])) != memento.get('fingerprint'):
+        return None, True
+        
+    if (input.changed
+            or memento.get('core') != params.core
+            or memento.get('target') != params.target
+            or memento.get('tool') != params.tool
+            or memento.get('libraries') != params.libraries):
+        return None, False
+        
+    return memento, False
+
+
 async def CoreResolve(runner, input: TaskDataInput[CoreResolveParams]) -> TaskDataResult:
     """
     Resolve a FuseSoC core and extract file lists.
@@ -85,6 +163,11 @@ async def CoreResolve(runner, input: TaskDataInput[CoreResolveParams]) -> TaskDa
     4. Extracts and converts file lists
     5. Returns file information for downstream tasks
     
+    When the task input is unchanged and the core file and sources recorded
+    in the memento are untouched, the previous resolution is returned
+    without invoking FuseSoC. If those files did change, the cached FuseSoC
+    managers are dropped so the core is parsed again.
+    
     Args:
         runner: Task runner context
         input: Task input with CoreResolveParams
@@ -95,24 +178,45 @@ async def CoreResolve(runner, input: TaskDataInput[CoreResolveParams]) -> TaskDa
     params: CoreResolveParams = input.params
     markers: List[TaskMarker] = []
     
+    # Reuse the previous resolution when nothing it depends on changed
+    memento, files_changed = _check_memento(input, params)
+    if memento is not None:
+        markers.append(TaskMarker(
+            severity=SeverityE.Info,
+            msg=f"Core {memento['core_name']} unchanged; reusing previous resolution"
+        ))
+        return TaskDataResult(
+            changed=False,
+            output=[memento['output']],
+            memento=memento,
+            markers=markers,
+            status=0
+        )
+    
+    # Cached managers hold cores parsed before the edit, so have the
+    # libraries scanned again
+    if files_changed:
+        get_manager.cache_clear()
+    
     try:
         # Determine workspace
         workspace = Path(params.workspace) if params.workspace else Path(input.rundir) / "fusesoc_workspace"
-        workspace.mkdir(parents=True, exist_ok=True)
-        
-        # Initialize FuseSoC manager
-        manager = FuseSoCManager()
+        if not os.path.isdir(workspace):
+            os.makedirs(workspace, exist_ok=True)
         
-        # Add libraries
-        for lib_name, lib_path in params.libraries.items():
-            manager.add_library(lib_name, Path(lib_path))
+        # Get a FuseSoC manager with the libraries added
+        manager = get_manager(
+            str(workspace),
+            tuple(sorted(params.libraries.items()))
+        )
         
-        # Build flags dictionary
-        flags = {}
-        if params.target:
-            flags['target'] = params.target
-        if params.tool:
-            flags['tool'] = params.tool
+        # Build flags once as sorted (name, value) pairs, which the manager
+        # also uses as its cache key
+        flags = tuple(
+            (name, value)
+            for name, value in (('target', params.target), ('tool', params.tool))
+            if value
+        )
         
         # Resolve core
         core = manager.resolve_core(params.core, flags=flags)
@@ -130,8 +234,7 @@ async def CoreResolve(runner, input: TaskDataInput[CoreResolveParams]) -> TaskDa
             core_root=Path(core_files['core_root']),
             files_root=Path(core_files['files_root'])
         )
-        converted_files = converter.convert_files(core_files['files'])
-        include_dirs = converter.extract_include_dirs(core_files['files'])
+        converted_files, include_dirs = converter.convert_and_extract(core_files['files'])
         
         markers.append(TaskMarker(
             severity=SeverityE.Info,
@@ -141,8 +244,9 @@ async def CoreResolve(runner, input: TaskDataInput[CoreResolveParams]) -> TaskDa
         # Get dependencies
         dependencies = manager.get_dependencies(core, flags=flags)
         
-        # Create output
-        output = CoreResolveOutput(
+        # Create output. Values come straight from FuseSoC and the
+        # converter, so validation and serialization are skipped.
+        output = CoreResolveOutput.model_construct(
             core_name=core_files['name'],
             core_root=core_files['core_root'],
             files_root=core_files['files_root'],
@@ -152,20 +256,27 @@ async def CoreResolve(runner, input: TaskDataInput[CoreResolveParams]) -> TaskDa
             include_dirs=include_dirs
         )
         
-        # Create memento for caching
-        import time
-        memento = CoreResolveMemento(
-            core=params.core,
-            target=params.target,
-            tool=params.tool,
-            core_name=core_files['name'],
-            last_resolution=time.time()
-        )
+        # Create memento for caching. It follows CoreResolveMemento, but is
+        # built as a plain dict since it is only ever serialized.
+        output_data = dict(output.__dict__)
+        core_file = getattr(core, 'core_file', None)
+        core_file = str(core_file) if core_file else None
+        memento = {
+            'core': params.core,
+            'target': params.target,
+            'tool': params.tool,
+            'libraries': dict(params.libraries),
+            'core_name': core_files['name'],
+            'core_file': core_file,
+            'fingerprint': _fingerprint(core_file, converted_files),
+            'output': output_data,
+            'last_resolution': time.time(),
+        }
         
         return TaskDataResult(
             changed=True,
-            output=[output.model_dump()],
-            memento=memento.model_dump(),
+            output=[output_data],
+            memento=memento,
             markers=markers,
             status=0
         )
@@ -17,8 +17,43 @@
 #*
 #****************************************************************************
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Map FuseSoC file types to common categories. Keys and values are
+# interned so lookups and type comparisons take the identity fast path.
+_FILE_TYPE_MAP = {sys.intern(k): sys.intern(v) for k, v in {
+    'verilogSource': 'verilog',
+    'systemVerilogSource': 'systemverilog',
+    'vhdlSource': 'vhdl',
+    'vhdlSource-2008': 'vhdl',
+    'tclSource': 'tcl',
+    'user': 'user',
+    'xdc': 'constraint',
+    'SDC': 'constraint',
+    'UCF': 'constraint',
+    'PCF': 'constraint',
+    'LPF': 'constraint',
+}.items()}
+
+# File types treated as HDL sources by get_source_files
+_SOURCE_TYPES = frozenset(('verilog', 'systemverilog', 'vhdl'))
+
+# Hot-path bindings for _convert_file
+_FTM_GET = _FILE_TYPE_MAP.get
+
+# (FuseSoC attribute, DV Flow attribute) pairs copied as-is
+_COPIED_ATTRS = (
+    ('is_include_file', 'is_include'),
+    ('logical_name', 'library'),
+    ('copyto', 'copyto'),
+    ('tags', 'tags'),
+)
+
+# Sentinel for attributes absent from a FuseSoC file entry
+_MISSING = object()
 
 
 class FilesetConverter:
@@ -28,19 +63,7 @@ class FilesetConverter:
     """
     
     # Map FuseSoC file types to common categories
-    FILE_TYPE_MAP = {
-        'verilogSource': 'verilog',
-        'systemVerilogSource': 'systemverilog',
-        'vhdlSource': 'vhdl',
-        'vhdlSource-2008': 'vhdl',
-        'tclSource': 'tcl',
-        'user': 'user',
-        'xdc': 'constraint',
-        'SDC': 'constraint',
-        'UCF': 'constraint',
-        'PCF': 'constraint',
-        'LPF': 'constraint',
-    }
+    FILE_TYPE_MAP = _FILE_TYPE_MAP
     
     def __init__(self, core_root: Path, files_root: Optional[Path] = None):
         """
@@ -53,24 +76,93 @@ class FilesetConverter:
         self.core_root = Path(core_root)
         self.files_root = Path(files_root) if files_root else self.core_root
         
+        # String forms of the roots for the os.path-based hot path
+        self._core_root_s = str(self.core_root)
+        self._files_root_s = str(self.files_root)
+        
+        # Resolved paths, keyed by the filename given in the core. Like the
+        # other lookup caches, it only lives for one conversion.
+        self._path_cache: Dict[str, str] = {}
+        
+        # Names present in each directory, listed once per directory
+        self._dir_listing: Dict[str, Dict[str, bool]] = {}
+        
+        # Canonical forms of parent directories
+        self._resolve_cache: Dict[str, str] = {}
+        
+        # Resolved paths that were not found (e.g. generated files)
+        self._missing: Set[str] = set()
+        
     def convert_files(self, fusesoc_files: List[Dict]) -> List[Dict]:
         """
         Convert FuseSoC file list to DV Flow format.
         
+        Entries are plain dicts, since they are passed through unchanged as
+        task output and consumed by EdamBuilder.add_files. Each holds 'path',
+        'type' and 'name', the FuseSoC attributes present on the file, and
+        'exists', whether the file was found when it was resolved. 'exists'
+        is a snapshot taken during this conversion: a file generated later
+        is only seen as existing once the list is converted again.
+        
         Args:
             fusesoc_files: List of files from FuseSoC core (from core.get_files())
             
         Returns:
             List of file dictionaries in DV Flow format
         """
+        return self._convert_all(fusesoc_files)[0]
+        
+    def convert_and_extract(self, fusesoc_files: List[Dict]) -> Tuple[List[Dict], List[str]]:
+        """
+        Convert a FuseSoC file list and extract its include directories
+        in a single pass.
+        
+        Args:
+            fusesoc_files: List of files from FuseSoC core (from core.get_files())
+            
+        Returns:
+            Tuple of (converted file list, sorted include directory paths)
+        """
+        converted_files, include_dirs = self._convert_all(fusesoc_files)
+        return converted_files, sorted(include_dirs)
+        
+    def _convert_all(self, fusesoc_files: List[Dict]) -> Tuple[List[Dict], Dict[str, None]]:
+        """
+        Convert a file list, collecting its include directories on the way.
+        
+        Returns:
+            Tuple of (converted file list, include directories in the
+            order they were found)
+        """
+        # Start from the current state of the filesystem, so a converter
+        # that is called again never serves stale paths
+        self._clear_caches()
+        
         converted_files = []
+        include_dirs: Dict[str, None] = {}
         
         for file_info in fusesoc_files:
             converted = self._convert_file(file_info)
-            if converted:
-                converted_files.append(converted)
+            
+            if 'include_path' in file_info:
+                include_dirs[self._resolve_file_path(file_info['include_path'])] = None
                 
-        return converted_files
+            if not converted:
+                continue
+            converted_files.append(converted)
+            
+            # Reuse the path resolved during conversion
+            if file_info.get('is_include_file', False):
+                include_dirs[os.path.dirname(converted['path'])] = None
+                
+        return converted_files, include_dirs
+        
+    def _clear_caches(self):
+        """Drop cached path resolutions and directory listings"""
+        self._path_cache.clear()
+        self._dir_listing.clear()
+        self._resolve_cache.clear()
+        self._missing.clear()
         
     def _convert_file(self, file_info: Dict) -> Optional[Dict]:
         """
@@ -86,38 +178,33 @@ class FilesetConverter:
         if not filename:
             return None
             
-        # Resolve absolute path
-        abs_path = self._resolve_file_path(filename)
-        
-        # Get file type
         file_type = file_info.get('file_type', 'user')
-        mapped_type = self.FILE_TYPE_MAP.get(file_type, file_type)
+        if type(file_type) is str:
+            file_type = sys.intern(file_type)
         
-        # Build converted entry
+        # Build converted entry. Existence is known from resolution, so
+        # consumers need not stat the file again.
+        path = self._resolve_file_path(filename)
         converted = {
-            'path': str(abs_path),
-            'type': mapped_type,
+            'path': path,
+            'type': _FTM_GET(file_type, file_type),
             'name': filename,
+            'exists': path not in self._missing,
         }
         
-        # Copy over relevant attributes
-        if 'is_include_file' in file_info:
-            converted['is_include'] = file_info['is_include_file']
-            
+        # Copy over relevant attributes, renaming where DV Flow differs
+        get = file_info.get
+        for src_key, dst_key in _COPIED_ATTRS:
+            value = get(src_key, _MISSING)
+            if value is not _MISSING:
+                converted[dst_key] = value
+                
         if 'include_path' in file_info:
             converted['include_path'] = self._resolve_file_path(file_info['include_path'])
             
-        if 'logical_name' in file_info:
-            converted['library'] = file_info['logical_name']
-            
-        # Copy any additional attributes
-        for key in ['copyto', 'tags']:
-            if key in file_info:
-                converted[key] = file_info[key]
-                
         return converted
         
-    def _resolve_file_path(self, filename: str) -> Path:
+    def _resolve_file_path(self, filename: str) -> str:
         """
         Resolve file path relative to core_root or files_root.
         
@@ -127,51 +214,119 @@ class FilesetConverter:
         Returns:
             Absolute path to the file
         """
+        if filename in self._path_cache:
+            return self._path_cache[filename]
+            
         if os.path.isabs(filename):
-            return Path(filename)
+            resolved = filename
+            if not self._exists(filename):
+                self._missing.add(resolved)
+        else:
+            resolved = self._lookup_file_path(filename)
             
+        self._path_cache[filename] = resolved
+        return resolved
+        
+    def _lookup_file_path(self, filename: str) -> str:
+        """Locate a relative file under core_root or files_root"""
         # Try core_root first
-        core_path = self.core_root / filename
-        if core_path.exists():
-            return core_path.resolve()
+        core_path = os.path.join(self._core_root_s, filename)
+        if self._exists(core_path):
+            return self._resolve(core_path)
             
         # Try files_root if different
-        if self.files_root != self.core_root:
-            files_path = self.files_root / filename
-            if files_path.exists():
-                return files_path.resolve()
+        if self._files_root_s != self._core_root_s:
+            files_path = os.path.join(self._files_root_s, filename)
+            if self._exists(files_path):
+                return self._resolve(files_path)
                 
         # Return core_root path even if doesn't exist (may be generated)
-        return core_path.resolve()
+        resolved = self._resolve(core_path)
+        self._missing.add(resolved)
+        return resolved
+        
+    def _resolve(self, path: str) -> str:
+        """
+        Canonicalize a path, resolving each parent directory only once.
+        
+        Args:
+            path: Path to resolve
+            
+        Returns:
+            Canonical absolute path
+        """
+        parent, name = os.path.split(path)
+        
+        # Symlinks and relative components need a full resolution
+        if not name or name in ('.', '..') or self._dir_entries(parent).get(name):
+            return os.path.realpath(path)
+            
+        resolved_parent = self._resolve_cache.get(parent)
+        if resolved_parent is None:
+            resolved_parent = os.path.realpath(parent)
+            self._resolve_cache[parent] = resolved_parent
+        return os.path.join(resolved_parent, name)
+        
+    def _exists(self, path: str) -> bool:
+        """Check for a path using the cached listing of its directory"""
+        parent, name = os.path.split(path)
+        if not name:
+            return os.path.exists(path)
+        return name in self._dir_entries(parent)
+        
+    def _dir_entries(self, directory: str) -> Dict[str, bool]:
+        """
+        Get the names in a directory, scanning it only once.
+        
+        Args:
+            directory: Directory to list
+            
+        Returns:
+            Map of entry name to whether it is a symlink (empty if the
+            directory does not exist)
+        """
+        entries = self._dir_listing.get(directory)
+        if entries is None:
+            try:
+                with os.scandir(directory) as it:
+                    entries = {entry.name: entry.is_symlink() for entry in it}
+            except OSError:
+                entries = {}
+            self._dir_listing[directory] = entries
+        return entries
         
     def extract_include_dirs(self, fusesoc_files: List[Dict]) -> List[str]:
         """
         Extract include directories from file list.
         
+        Paths are resolved afresh, without reusing lookups from an earlier
+        convert_files call. Use convert_and_extract to get the converted
+        files and their include directories in a single pass.
+        
         Args:
             fusesoc_files: List of files from FuseSoC core
             
         Returns:
             List of include directory paths
         """
-        include_dirs = set()
+        self._clear_caches()
+        include_dirs: Dict[str, None] = {}
         
         for file_info in fusesoc_files:
             # Check for explicit include_path attribute
             if 'include_path' in file_info:
-                inc_path = self._resolve_file_path(file_info['include_path'])
-                include_dirs.add(str(inc_path))
+                include_dirs[self._resolve_file_path(file_info['include_path'])] = None
                 
             # Check if file is marked as include file
             if file_info.get('is_include_file', False):
                 filename = file_info.get('name')
                 if filename:
                     file_path = self._resolve_file_path(filename)
-                    include_dirs.add(str(file_path.parent))
+                    include_dirs[os.path.dirname(file_path)] = None
                     
-        return sorted(list(include_dirs))
+        return sorted(include_dirs)
         
-    def filter_by_type(self, converted_files: List[Dict], file_types: List[str]) -> List[Dict]:
+    def filter_by_type(self, converted_files: List[Dict], file_types: Iterable[str]) -> List[Dict]:
         """
         Filter files by type.
         
@@ -182,7 +337,8 @@ class FilesetConverter:
         Returns:
             Filtered list of files
         """
-        return [f for f in converted_files if f.get('type') in file_types]
+        types = frozenset(file_types)
+        return [f for f in converted_files if f.get('type') in types]
         
     def get_source_files(self, converted_files: List[Dict]) -> List[Dict]:
         """
@@ -194,5 +350,4 @@ class FilesetConverter:
         Returns:
             List of source files
         """
-        source_types = ['verilog', 'systemverilog', 'vhdl']
-        return self.filter_by_type(converted_files, source_types)
+        return [f for f in converted_files if f.get('type') in _SOURCE_TYPES]
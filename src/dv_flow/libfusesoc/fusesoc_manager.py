@@ -16,12 +16,43 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import copy
+import functools
 import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple, Union
 from fusesoc.coremanager import CoreManager
-from fusesoc.librarymanager import LibraryManager
+from fusesoc.librarymanager import Library, LibraryManager
 from fusesoc.config import Config
+from fusesoc.vlnv import Vlnv
+
+
+# Resolution flags, either as a dict or as sorted (name, value) pairs
+Flags = Union[Dict, Tuple[Tuple[str, str], ...]]
+
+
+def _split_flags(flags: Optional[Flags]) -> Tuple[Dict, Tuple]:
+    """Get the dict FuseSoC expects and a hashable key for a set of flags"""
+    if not flags:
+        return {}, ()
+    if isinstance(flags, tuple):
+        return dict(flags), flags
+    return flags, tuple(sorted(flags.items()))
+
+
+@functools.lru_cache(maxsize=512)
+def _parse_vlnv(core_name: str) -> Vlnv:
+    """Parse a core name, sharing the (read-only) Vlnv across calls"""
+    return Vlnv(core_name)
+
+
+def _copy_core_files(core_files: Dict) -> Dict:
+    """Copy a cached get_core_files result, including its mutable fields"""
+    copied = dict(core_files)
+    copied['files'] = copy.deepcopy(core_files['files'])
+    copied['dependencies'] = list(core_files['dependencies'])
+    copied['parameters'] = copy.deepcopy(core_files['parameters'])
+    return copied
 
 
 class FuseSoCManager:
@@ -46,6 +77,18 @@ class FuseSoCManager:
         self._library_manager = LibraryManager(self._config)
         self._core_manager = None
         
+        # Names of libraries already added and scanned
+        self._added_libs: Set[str] = set()
+        
+        # Resolved cores by name. Cleared when a library is added, since
+        # that can change which core a name resolves to.
+        self._core_cache: Dict[str, object] = {}
+        
+        # Per-core results, keyed by (id(core), flags). Cores are held by
+        # the core database, so their ids stay valid for the manager's life.
+        self._files_cache: Dict[Tuple[int, Tuple], Dict] = {}
+        self._depends_cache: Dict[Tuple[int, Tuple], List[str]] = {}
+        
     def _init_config(self) -> Config:
         """Initialize FuseSoC configuration with isolated paths"""
         # If isolated directories specified, pass config file path to Config
@@ -74,8 +117,10 @@ class FuseSoCManager:
             path: Local path to library
             sync_uri: Optional remote URI for library sync
         """
-        from fusesoc.librarymanager import Library
-        
+        # Libraries are only scanned once per manager
+        if name in self._added_libs:
+            return
+            
         library = Library(
             name=name,
             location=str(path),
@@ -92,8 +137,11 @@ class FuseSoCManager:
         # Add found cores to database
         for core in found_cores:
             core_manager.db.add(core, library)
+            
+        self._added_libs.add(name)
+        self._core_cache.clear()
         
-    def resolve_core(self, core_name: str, flags: Optional[Dict] = None):
+    def resolve_core(self, core_name: str, flags: Optional[Flags] = None):
         """
         Resolve a core by name/VLNV.
         
@@ -104,13 +152,14 @@ class FuseSoCManager:
         Returns:
             Resolved core object with file lists and metadata
         """
-        from fusesoc.vlnv import Vlnv
+        core = self._core_cache.get(core_name)
+        if core is not None:
+            return core
         
         core_manager = self.get_core_manager()
-        flags = flags or {}
         
         # Parse and resolve the core
-        vlnv = Vlnv(core_name)
+        vlnv = _parse_vlnv(core_name)
         core = core_manager.get_core(vlnv)
         
         # Fetch remote dependencies if needed
@@ -118,9 +167,10 @@ class FuseSoCManager:
             if core.provider.status() != 'downloaded':
                 core.provider.fetch()
         
+        self._core_cache[core_name] = core
         return core
         
-    def get_core_files(self, core, flags: Optional[Dict] = None):
+    def get_core_files(self, core, flags: Optional[Flags] = None):
         """
         Get file lists from a resolved core.
         
@@ -129,24 +179,28 @@ class FuseSoCManager:
             flags: Optional flags for target selection (e.g., {'tool': 'icarus', 'target': 'sim'})
             
         Returns:
-            Dictionary containing file lists with attributes, include directories, and metadata
+            Dictionary containing file lists with attributes, include directories, and metadata.
+            Each call returns a fresh copy, so callers may modify it.
         """
-        flags = flags or {}
+        flags, flags_key = _split_flags(flags)
+        key = (id(core), flags_key)
+        
+        core_files = self._files_cache.get(key)
+        if core_files is not None:
+            return _copy_core_files(core_files)
         
         # Get files with their attributes from the core
         files = core.get_files(flags)
         
         # Extract dependencies
-        dependencies = []
-        if hasattr(core, 'get_depends'):
-            dependencies = [str(dep) for dep in core.get_depends(flags)]
+        dependencies = self.get_dependencies(core, flags_key)
         
         # Get parameters if available
         parameters = {}
         if hasattr(core, 'get_parameters'):
             parameters = core.get_parameters(flags)
         
-        return {
+        core_files = {
             'files': files,
             'name': str(core.name),
             'core_root': core.core_root,
@@ -154,8 +208,11 @@ class FuseSoCManager:
             'dependencies': dependencies,
             'parameters': parameters,
         }
+        self._files_cache[key] = core_files
         
-    def get_dependencies(self, core, flags: Optional[Dict] = None):
+        return _copy_core_files(core_files)
+        
+    def get_dependencies(self, core, flags: Optional[Flags] = None):
         """
         Get dependency tree for a core.
         
@@ -164,19 +221,22 @@ class FuseSoCManager:
             flags: Optional flags for dependency resolution
             
         Returns:
-            List of dependent cores
+            List of dependent cores (a fresh list on each call)
         """
-        core_manager = self.get_core_manager()
-        flags = flags or {}
+        flags, flags_key = _split_flags(flags)
+        key = (id(core), flags_key)
         
-        # Get direct dependencies
-        if hasattr(core, 'get_depends'):
-            depends = core.get_depends(flags)
-            return [str(dep) for dep in depends]
+        dependencies = self._depends_cache.get(key)
+        if dependencies is None:
+            # Get direct dependencies
+            dependencies = []
+            if hasattr(core, 'get_depends'):
+                dependencies = [str(dep) for dep in core.get_depends(flags)]
+            self._depends_cache[key] = dependencies
         
-        return []
+        return list(dependencies)
     
-    def resolve_dependencies(self, core_name: str, flags: Optional[Dict] = None):
+    def resolve_dependencies(self, core_name: str, flags: Optional[Flags] = None):
         """
         Recursively resolve all dependencies for a core.
         
@@ -187,14 +247,47 @@ class FuseSoCManager:
         Returns:
             List of all resolved cores including dependencies
         """
-        from fusesoc.vlnv import Vlnv
-        
         core_manager = self.get_core_manager()
-        flags = flags or {}
+        flags, _ = _split_flags(flags)
         
-        vlnv = Vlnv(core_name)
+        vlnv = _parse_vlnv(core_name)
         
         # Use FuseSoC's dependency resolution
         cores = core_manager.get_depends(vlnv, flags)
         
         return cores
+
+
+# Each cached manager holds the scanned core database of its libraries,
+# so only a handful are kept. A flow normally resolves every core against
+# the same workspace and library set; target and tool don't need a
+# separate manager.
+_MANAGER_CACHE_SIZE = 4
+
+
+@functools.lru_cache(maxsize=_MANAGER_CACHE_SIZE)
+def get_manager(workspace: str,
+                libraries: Tuple[Tuple[str, str], ...] = (),
+                config_dir: Optional[str] = None) -> FuseSoCManager:
+    """
+    Get a process-wide FuseSoC manager with the given libraries added.
+    
+    Managers are cached, so repeated resolutions against the same
+    workspace and libraries reuse the already-scanned core database.
+    
+    Args:
+        workspace: FuseSoC workspace directory. It is not used by the
+            manager itself; it only partitions the cache, so resolutions
+            in different workspaces never share a manager.
+        libraries: Sorted (name, path) pairs of libraries to add
+        config_dir: Optional directory for FuseSoC configuration
+        
+    Returns:
+        FuseSoCManager instance
+    """
+    manager = FuseSoCManager(config_dir=Path(config_dir) if config_dir else None)
+    
+    for lib_name, lib_path in libraries:
+        manager.add_library(lib_name, Path(lib_path))
+        
+    return manager
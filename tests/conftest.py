@@ -2,43 +2,45 @@ import os
 import pytest
 import shutil
 from pathlib import Path
-from typing import Dict
+from types import SimpleNamespace
+from typing import Optional
+from dv_flow.libfusesoc.fusesoc_manager import FuseSoCManager, get_manager
+
+
+def _link_or_copy(src: Path, dest: Path):
+    """Place src at dest via hardlink, then symlink, then copy"""
+    try:
+        os.link(src, dest)
+        return
+    except (OSError, NotImplementedError):
+        pass
+    try:
+        os.symlink(os.path.abspath(src), dest)
+        return
+    except (OSError, NotImplementedError):
+        pass
+    shutil.copy(src, dest)
 
 
 class IsolatedFuseSoCWorkspace:
     """Context manager for isolated FuseSoC workspace"""
     
-    def __init__(self, tmp_path: Path):
+    def __init__(self, tmp_path: Path, monkeypatch: Optional[pytest.MonkeyPatch] = None):
         self.tmp_path = tmp_path
+        self.monkeypatch = monkeypatch
         self.workspace = tmp_path / "fusesoc_workspace"
         self.config_dir = tmp_path / "config"
         self.data_dir = tmp_path / "data"
         self.cache_dir = tmp_path / "cache"
-        self.old_env = {}
         
     def __enter__(self):
         # Create directories
-        self.workspace.mkdir(parents=True, exist_ok=True)
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-        self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        for directory in (self.workspace, self.config_dir, self.data_dir, self.cache_dir):
+            if not os.path.isdir(directory):
+                os.makedirs(directory, exist_ok=True)
         
-        # Save and override environment variables
-        env_vars = [
-            'XDG_DATA_HOME',
-            'XDG_CONFIG_HOME',
-            'XDG_CACHE_HOME',
-            'FUSESOC_CORES_ROOT',
-        ]
-        
-        for var in env_vars:
-            self.old_env[var] = os.environ.get(var)
-        
-        # Set isolated environment
-        os.environ['XDG_DATA_HOME'] = str(self.data_dir)
-        os.environ['XDG_CONFIG_HOME'] = str(self.config_dir)
-        os.environ['XDG_CACHE_HOME'] = str(self.cache_dir)
-        os.environ['FUSESOC_CORES_ROOT'] = str(self.workspace)
+        if self.monkeypatch is not None:
+            self.apply_env(self.monkeypatch)
         
         # Create minimal FuseSoC config
         fusesoc_conf_dir = self.config_dir / "fusesoc"
@@ -49,27 +51,46 @@ class IsolatedFuseSoCWorkspace:
         return self
         
     def __exit__(self, *args):
-        # Restore old environment
-        for var, value in self.old_env.items():
-            if value is None:
-                os.environ.pop(var, None)
-            else:
-                os.environ[var] = value
+        # Environment is restored by monkeypatch, and cleanup is handled
+        # by the tmp_path fixture
+        pass
         
-        # Cleanup is handled by tmp_path fixture
+    def apply_env(self, monkeypatch: pytest.MonkeyPatch):
+        """Point the environment at this workspace until monkeypatch undoes it"""
+        setenv = monkeypatch.setenv
+        setenv('XDG_DATA_HOME', str(self.data_dir))
+        setenv('XDG_CONFIG_HOME', str(self.config_dir))
+        setenv('XDG_CACHE_HOME', str(self.cache_dir))
+        setenv('FUSESOC_CORES_ROOT', str(self.workspace))
+        
+    def reset(self):
+        """Empty the core workspace and remove anything else a test left behind"""
+        keep = {self.workspace, self.config_dir, self.data_dir, self.cache_dir}
+        
+        shutil.rmtree(self.workspace)
+        self.workspace.mkdir()
+        
+        for path in self.tmp_path.iterdir():
+            if path in keep:
+                continue
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path)
+            else:
+                path.unlink()
         
     def add_test_core(self, core_file: Path, sources: list = None):
         """Add a test .core file to workspace with optional source files"""
-        # Copy core file
+        # Link core file. Tests only read the workspace, so sharing the
+        # fixture files is safe.
         dest_core = self.workspace / core_file.name
-        shutil.copy(core_file, dest_core)
+        _link_or_copy(core_file, dest_core)
         
-        # Copy source files if provided
+        # Link source files if provided
         if sources:
             for src in sources:
                 src_path = Path(src)
                 dest_src = self.workspace / src_path.name
-                shutil.copy(src_path, dest_src)
+                _link_or_copy(src_path, dest_src)
                 
         return dest_core
         
@@ -84,14 +105,50 @@ class IsolatedFuseSoCWorkspace:
         return self.workspace
 
 
+@pytest.fixture(scope="session")
+def fusesoc_session_workspace(tmp_path_factory):
+    """
+    Create the FuseSoC workspace directories and config once per session.
+    Use isolated_fusesoc_workspace, which adds per-test environment
+    isolation and cleanup.
+    """
+    with IsolatedFuseSoCWorkspace(tmp_path_factory.mktemp("fusesoc_ws")) as workspace:
+        yield workspace
+
+
 @pytest.fixture
-def isolated_fusesoc_workspace(tmp_path):
+def isolated_fusesoc_workspace(fusesoc_session_workspace, monkeypatch):
     """
-    Create isolated FuseSoC workspace in tmp_path.
-    Sets environment variables to isolate from user installation.
+    Provide an isolated FuseSoC workspace.
+    Sets environment variables to isolate from user installation, and
+    empties the workspace again after the test.
     Returns IsolatedFuseSoCWorkspace instance.
     """
-    with IsolatedFuseSoCWorkspace(tmp_path) as workspace:
+    workspace = fusesoc_session_workspace
+    workspace.apply_env(monkeypatch)
+    
+    yield workspace
+    
+    workspace.reset()
+    
+    # Cached managers may hold cores scanned from this workspace
+    get_manager.cache_clear()
+
+
+@pytest.fixture(scope="module")
+def prepared_workspace(tmp_path_factory, test_cores_dir):
+    """Workspace holding the simple test core, shared by the resolve tests"""
+    test_core = test_cores_dir / "simple.core"
+    test_sources = [
+        test_cores_dir / "simple.v",
+        test_cores_dir / "simple_tb.v"
+    ]
+    
+    if not test_core.exists():
+        pytest.skip("Test core files not found")
+        
+    with IsolatedFuseSoCWorkspace(tmp_path_factory.mktemp("core_resolve")) as workspace:
+        workspace.add_test_core(test_core, test_sources)
         yield workspace
 
 
@@ -106,8 +163,49 @@ def isolated_edalize_workspace(tmp_path):
     return build_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_cores_dir():
     """Return path to test cores directory"""
     tests_dir = Path(__file__).parent
     return tests_dir / "fixtures" / "test_cores"
+
+
+@pytest.fixture(scope="session")
+def shared_simple_core_workspace(tmp_path_factory, test_cores_dir):
+    """
+    Resolve the simple test core once per session.
+    Tests that only read the resolved core share this instead of building
+    their own workspace. Returns a namespace with the workspace, manager,
+    resolved core, and its files for the default and 'sim' targets.
+    """
+    test_core = test_cores_dir / "simple.core"
+    test_sources = [
+        test_cores_dir / "simple.v",
+        test_cores_dir / "simple_tb.v"
+    ]
+    
+    if not test_core.exists():
+        pytest.skip("Test core files not found")
+        
+    tmp_path = tmp_path_factory.mktemp("shared_simple_core")
+    
+    # The environment is only isolated while FuseSoC scans and resolves
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        with IsolatedFuseSoCWorkspace(tmp_path, monkeypatch) as workspace:
+            workspace.add_test_core(test_core, test_sources)
+            
+            manager = FuseSoCManager(
+                config_dir=workspace.config_dir,
+                data_dir=workspace.data_dir
+            )
+            manager.add_library("test", workspace.workspace)
+            
+            core = manager.resolve_core("test:cores:simple:1.0")
+            
+            return SimpleNamespace(
+                workspace=workspace,
+                manager=manager,
+                core=core,
+                core_files_sim=manager.get_core_files(core, flags={'target': 'sim'}),
+                core_files_default=manager.get_core_files(core, flags={}),
+            )
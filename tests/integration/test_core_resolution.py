@@ -18,44 +18,25 @@
 #****************************************************************************
 import pytest
 from pathlib import Path
-from dv_flow.libfusesoc.fusesoc_manager import FuseSoCManager
 from dv_flow.libfusesoc.fusesoc_fileset import FilesetConverter
 
 
-def test_resolve_simple_core(isolated_fusesoc_workspace, test_cores_dir):
+# Tests sharing the session-resolved core stay on one xdist worker
+pytestmark = pytest.mark.xdist_group("fusesoc_shared_core")
+
+
+def test_resolve_simple_core(shared_simple_core_workspace):
     """Test resolving a simple test core in isolated environment"""
-    workspace = isolated_fusesoc_workspace
-    
-    # Copy test core to workspace
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    # Create manager
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    
-    # Add workspace as a library
-    manager.add_library("test", workspace.workspace)
-    
-    # Resolve the core
-    core = manager.resolve_core("test:cores:simple:1.0")
+    shared = shared_simple_core_workspace
+    workspace = shared.workspace
     
     # Verify core was resolved
+    core = shared.core
     assert core is not None
     assert str(core.name) == "test:cores:simple:1.0"
     
     # Get files for sim target
-    core_files = manager.get_core_files(core, flags={'target': 'sim'})
+    core_files = shared.core_files_sim
     
     # Verify we got files
     assert 'files' in core_files
@@ -68,30 +49,9 @@ def test_resolve_simple_core(isolated_fusesoc_workspace, test_cores_dir):
         assert not file_path.is_absolute() or str(workspace.workspace) in str(file_path)
 
 
-def test_convert_core_files(isolated_fusesoc_workspace, test_cores_dir):
+def test_convert_core_files(shared_simple_core_workspace):
     """Test converting FuseSoC core files to DV Flow format"""
-    workspace = isolated_fusesoc_workspace
-    
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    # Create manager and resolve core
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    manager.add_library("test", workspace.workspace)
-    
-    core = manager.resolve_core("test:cores:simple:1.0")
-    core_files = manager.get_core_files(core, flags={'target': 'sim'})
+    core_files = shared_simple_core_workspace.core_files_sim
     
     # Convert files using FilesetConverter
     converter = FilesetConverter(
@@ -120,31 +80,12 @@ def test_convert_core_files(isolated_fusesoc_workspace, test_cores_dir):
     assert any(f['type'] in ['verilog', 'systemverilog'] for f in source_files)
 
 
-def test_core_dependencies(isolated_fusesoc_workspace, test_cores_dir):
+def test_core_dependencies(shared_simple_core_workspace):
     """Test getting core dependencies"""
-    workspace = isolated_fusesoc_workspace
-    
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    manager.add_library("test", workspace.workspace)
-    
-    core = manager.resolve_core("test:cores:simple:1.0")
+    shared = shared_simple_core_workspace
     
     # Get dependencies
-    deps = manager.get_dependencies(core, flags={'target': 'sim'})
+    deps = shared.manager.get_dependencies(shared.core, flags={'target': 'sim'})
     
     # Simple core has no dependencies
     assert isinstance(deps, list)
@@ -152,32 +93,13 @@ def test_core_dependencies(isolated_fusesoc_workspace, test_cores_dir):
     # (More complex test would need a core with dependencies)
 
 
-def test_target_specific_files(isolated_fusesoc_workspace, test_cores_dir):
+def test_target_specific_files(shared_simple_core_workspace):
     """Test that target-specific filesets are respected"""
-    workspace = isolated_fusesoc_workspace
-    
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    manager.add_library("test", workspace.workspace)
-    
-    core = manager.resolve_core("test:cores:simple:1.0")
+    shared = shared_simple_core_workspace
     
     # Get files for different targets
-    default_files = manager.get_core_files(core, flags={})
-    sim_files = manager.get_core_files(core, flags={'target': 'sim'})
+    default_files = shared.core_files_default
+    sim_files = shared.core_files_sim
     
     # sim target should include both rtl and tb filesets
     # default target should only include rtl
@@ -19,42 +19,29 @@
 import pytest
 import shutil
 from pathlib import Path
-from dv_flow.libfusesoc.fusesoc_manager import FuseSoCManager
 from dv_flow.libfusesoc.edam_builder import build_edam_from_core
 from dv_flow.libfusesoc.edalize_backend import create_sim_backend
 
 
+# Tests sharing the session-resolved core stay on one xdist worker
+pytestmark = pytest.mark.xdist_group("fusesoc_shared_core")
+
+
+_TOOL_CACHE = {}
+
+
 def check_tool_available(tool_name):
-    """Check if a tool is available in PATH"""
-    return shutil.which(tool_name) is not None
+    """Check if a tool is available in PATH, searching only once per tool"""
+    if tool_name not in _TOOL_CACHE:
+        _TOOL_CACHE[tool_name] = shutil.which(tool_name) is not None
+    return _TOOL_CACHE[tool_name]
 
 
 @pytest.mark.skipif(not check_tool_available('iverilog'), reason="Icarus Verilog not available")
-def test_icarus_simulation_e2e(isolated_fusesoc_workspace, test_cores_dir):
+def test_icarus_simulation_e2e(shared_simple_core_workspace, tmp_path):
     """End-to-end test: FuseSoC core -> EDAM -> Edalize -> Icarus simulation"""
-    workspace = isolated_fusesoc_workspace
-    
-    # Setup test core
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    # Step 1: Resolve core with FuseSoC
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    manager.add_library("test", workspace.workspace)
-    
-    core = manager.resolve_core("test:cores:simple:1.0")
-    core_files = manager.get_core_files(core, flags={'target': 'sim'})
+    # Step 1: Resolve core with FuseSoC (shared across the session)
+    core_files = shared_simple_core_workspace.core_files_sim
     
     # Step 2: Build EDAM
     edam = build_edam_from_core(
@@ -70,7 +57,7 @@ def test_icarus_simulation_e2e(isolated_fusesoc_workspace, test_cores_dir):
     assert edam['flow_options']['tool'] == 'icarus'
     
     # Step 3: Create Edalize backend and configure
-    work_root = workspace.tmp_path / "icarus_work"
+    work_root = tmp_path / "icarus_work"
     backend = create_sim_backend(edam, work_root, verbose=True)
     
     success = backend.configure()
@@ -95,31 +82,10 @@ def test_icarus_simulation_e2e(isolated_fusesoc_workspace, test_cores_dir):
 
 
 @pytest.mark.skipif(not check_tool_available('verilator'), reason="Verilator not available")
-def test_verilator_simulation_e2e(isolated_fusesoc_workspace, test_cores_dir):
+def test_verilator_simulation_e2e(shared_simple_core_workspace, tmp_path):
     """End-to-end test with Verilator"""
-    workspace = isolated_fusesoc_workspace
-    
-    # Setup test core
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    # Resolve core
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    manager.add_library("test", workspace.workspace)
-    
-    core = manager.resolve_core("test:cores:simple:1.0")
-    core_files = manager.get_core_files(core, flags={'target': 'sim'})
+    # Resolve core (shared across the session)
+    core_files = shared_simple_core_workspace.core_files_sim
     
     # Build EDAM for Verilator
     edam = build_edam_from_core(
@@ -134,7 +100,7 @@ def test_verilator_simulation_e2e(isolated_fusesoc_workspace, test_cores_dir):
     edam['tool_options']['verilator']['mode'] = 'cc'
     
     # Create backend and run
-    work_root = workspace.tmp_path / "verilator_work"
+    work_root = tmp_path / "verilator_work"
     backend = create_sim_backend(edam, work_root, verbose=True)
     
     # Configure
@@ -153,30 +119,10 @@ def test_verilator_simulation_e2e(isolated_fusesoc_workspace, test_cores_dir):
         # Note: Verilator C++ model may need main() function
 
 
-def test_edam_from_fusesoc_integration(isolated_fusesoc_workspace, test_cores_dir):
+def test_edam_from_fusesoc_integration(shared_simple_core_workspace):
     """Test EDAM building from FuseSoC core without running simulation"""
-    workspace = isolated_fusesoc_workspace
-    
-    test_core = test_cores_dir / "simple.core"
-    test_sources = [
-        test_cores_dir / "simple.v",
-        test_cores_dir / "simple_tb.v"
-    ]
-    
-    if not test_core.exists():
-        pytest.skip("Test core files not found")
-    
-    workspace.add_test_core(test_core, test_sources)
-    
-    # Resolve core
-    manager = FuseSoCManager(
-        config_dir=workspace.config_dir,
-        data_dir=workspace.data_dir
-    )
-    manager.add_library("test", workspace.workspace)
-    
-    core = manager.resolve_core("test:cores:simple:1.0")
-    core_files = manager.get_core_files(core, flags={'target': 'sim'})
+    workspace = shared_simple_core_workspace.workspace
+    core_files = shared_simple_core_workspace.core_files_sim
     
     # Build EDAM with parameters
     edam = build_edam_from_core(
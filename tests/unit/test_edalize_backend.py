@@ -0,0 +1,405 @@
+#****************************************************************************
+#* test_edalize_backend.py
+#*
+#* Copyright 2023-2025 Matthew Ballance and Contributors
+#*
+#* Licensed under the Apache License, Version 2.0 (the "License"); you may
+#* not use this file except in compliance with the License.
+#* You may obtain a copy of the License at:
+#*
+#*   http://www.apache.org/licenses/LICENSE-2.0
+#*
+#* Unless required by applicable law or agreed to in writing, software
+#* distributed under the License is distributed on an "AS IS" BASIS,
+#* WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#* See the License for the specific language governing permissions and
+#* limitations under the License.
+#*
+#****************************************************************************
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from dv_flow.libfusesoc import edalize_backend
+from dv_flow.libfusesoc.edalize_backend import (
+    EdalizeBackend, EDAM_FILE, EDAM_HASH_FILE, BUILD_LOG_FILE, FLOW_STATE_FILE,
+    create_sim_backend
+)
+
+
+class FakeFlow:
+    """Stand-in for an Edalize flow that records lifecycle calls"""
+
+    init_count = 0
+    configure_count = 0
+    build_count = 0
+
+    def __init__(self, edam, work_root, verbose=False):
+        FakeFlow.init_count += 1
+        self.edam = edam
+        self.work_root = work_root
+
+    def configure(self):
+        FakeFlow.configure_count += 1
+
+    def build(self):
+        # Mimic Verilator producing V<toplevel> in work_root
+        FakeFlow.build_count += 1
+        exe = os.path.join(self.work_root, "V" + self.edam['toplevel'])
+        with open(exe, "w") as f:
+            f.write("model")
+
+    def run(self):
+        pass
+
+
+@pytest.fixture
+def fake_flow():
+    FakeFlow.init_count = 0
+    FakeFlow.configure_count = 0
+    FakeFlow.build_count = 0
+    return FakeFlow
+
+
+def make_edam(src_file, tool_options=None, tool='icarus'):
+    return {
+        'name': 'test',
+        'files': [{'name': str(src_file), 'file_type': 'verilogSource'}],
+        'toplevel': 'test',
+        'flow_options': {'tool': tool},
+        'tool_options': tool_options or {},
+        'parameters': {},
+    }
+
+
+def test_configure_writes_edam_hash(tmp_path, fake_flow):
+    """Test that configure records the EDAM and its hash"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    work_root = tmp_path / "work"
+
+    backend = EdalizeBackend(fake_flow, make_edam(src), work_root)
+
+    assert backend.configure()
+    assert fake_flow.configure_count == 1
+    assert (work_root / EDAM_FILE).exists()
+    assert (work_root / EDAM_HASH_FILE).exists()
+    assert backend.is_configured()
+
+
+def test_configure_skipped_when_unchanged(tmp_path, fake_flow):
+    """Test that an identical EDAM does not re-run configure"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    work_root = tmp_path / "work"
+
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+
+    backend = EdalizeBackend(fake_flow, make_edam(src), work_root)
+    assert backend.configure()
+
+    # Flow is restored from saved state, and configure only ran once
+    assert backend.flow is not None
+    assert backend.flow.work_root == str(work_root)
+    assert fake_flow.init_count == 1
+    assert fake_flow.configure_count == 1
+
+
+def test_configure_rerun_after_edalize_upgrade(tmp_path, fake_flow, monkeypatch):
+    """Test that flow state saved by another Edalize version is not restored"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    work_root = tmp_path / "work"
+
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+
+    monkeypatch.setattr(edalize_backend, '_EDALIZE_VERSION', 'upgraded')
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+
+    assert fake_flow.init_count == 2
+    assert fake_flow.configure_count == 2
+
+
+def test_configure_rerun_on_unreadable_state(tmp_path, fake_flow):
+    """Test that corrupt flow state is treated as needing configure"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    work_root = tmp_path / "work"
+
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+    (work_root / FLOW_STATE_FILE).write_bytes(b"not a pickle")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src), work_root)
+    assert backend.configure()
+
+    assert backend.flow is not None
+    assert fake_flow.configure_count == 2
+
+
+def test_configure_rerun_on_option_change(tmp_path, fake_flow):
+    """Test that changed tool options invalidate the hash"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    work_root = tmp_path / "work"
+
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+
+    edam = make_edam(src, {'icarus': {'iverilog_options': ['-g2012']}})
+    assert EdalizeBackend(fake_flow, edam, work_root).configure()
+
+    assert fake_flow.configure_count == 2
+
+
+def test_configure_rerun_on_source_change(tmp_path, fake_flow):
+    """Test that a source newer than the hash invalidates it"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    work_root = tmp_path / "work"
+
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+
+    # Push the source mtime past the recorded hash
+    hash_mtime = (work_root / EDAM_HASH_FILE).stat().st_mtime
+    os.utime(src, (hash_mtime + 10, hash_mtime + 10))
+
+    assert EdalizeBackend(fake_flow, make_edam(src), work_root).configure()
+
+    assert fake_flow.configure_count == 2
+
+
+def test_build_cache_roundtrip(tmp_path, fake_flow, monkeypatch):
+    """Test that build artifacts are restored from the cache"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work1")
+    assert backend.configure()
+    assert not backend.restore_cached_build()
+
+    success, _ = backend.build()
+    assert success
+    assert backend.store_cached_build()
+
+    # A fresh work directory with the same inputs is served from the cache
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work2")
+    assert backend.configure()
+    assert backend.restore_cached_build()
+    assert backend.find_build_artifact() == tmp_path / "work2" / "Vtest"
+    assert fake_flow.build_count == 1
+
+
+@pytest.mark.skipif(shutil.which('make') is None, reason="make not available")
+def test_restored_build_is_up_to_date(tmp_path, monkeypatch):
+    """Test that a restored artifact is not rebuilt by the Edalize Makefile"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "cache"))
+
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+    edam = make_edam(src)
+    edam['name'] = 'test_design'
+
+    work_root = tmp_path / "work"
+    backend = create_sim_backend(edam, work_root)
+    assert backend.configure()
+
+    # Seed the cache with an artifact cached long before this configure
+    entry = backend._build_cache_entry()
+    entry.mkdir(parents=True)
+    (entry / "test_design").write_text("compiled")
+    os.utime(entry / "test_design", (1, 1))
+
+    assert backend.restore_cached_build()
+
+    # make -q exits 0 only if the target needs no rebuild
+    result = subprocess.run(['make', '-q', 'test_design'], cwd=work_root)
+    assert result.returncode == 0
+
+
+def test_build_cache_keyed_on_content(tmp_path, fake_flow):
+    """Test that source content changes the build cache key"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work")
+    key = backend.build_cache_key()
+
+    src.write_text("module test; wire w; endmodule")
+    assert backend.build_cache_key() != key
+
+
+class FakeBuildRunner:
+    """Build runner that produces the Verilator model via a subprocess"""
+
+    script = 'print("compiling"); open("Vtest", "w").close()'
+
+    def get_build_command(self):
+        return (sys.executable, ['-c', self.script])
+
+
+class FailingBuildRunner(FakeBuildRunner):
+    """Build runner whose build command fails"""
+
+    script = 'import sys; print("line 1"); print("error: bad"); sys.exit(2)'
+
+
+class StdinBuildRunner(FakeBuildRunner):
+    """Build runner that reads stdin, as an interactive tool would"""
+
+    script = 'import sys; print(repr(sys.stdin.read())); open("Vtest", "w").close()'
+
+
+class LongLineBuildRunner(FakeBuildRunner):
+    """Build runner that prints a line far longer than any read buffer"""
+
+    script = ('import sys; sys.stdout.write("x" * (4 * 1024 * 1024)); print();'
+              'print("done"); open("Vtest", "w").close()')
+
+
+class HangingBuildRunner(FakeBuildRunner):
+    """Build runner that records its pid and never finishes"""
+
+    script = 'import os, time; open("build.pid", "w").write(str(os.getpid())); time.sleep(60)'
+
+
+@pytest.mark.asyncio
+async def test_build_async_concurrent(tmp_path, fake_flow):
+    """Test that several designs can be built concurrently"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backends = []
+    for i in range(3):
+        backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / f"work{i}")
+        assert backend.configure()
+        backends.append(backend)
+
+    # One backend drives the build command as a subprocess
+    backends[0].flow.build_runner = FakeBuildRunner()
+
+    results = await asyncio.gather(*(b.build_async() for b in backends))
+
+    assert all(success for success, _ in results)
+    for backend in backends:
+        assert backend.find_build_artifact() is not None
+
+    # Subprocess output is streamed to the build log
+    assert (tmp_path / "work0" / BUILD_LOG_FILE).read_text() == "compiling\n"
+
+
+@pytest.mark.asyncio
+async def test_build_async_failure_reports_tail(tmp_path, fake_flow):
+    """Test that a failed build reports the end of its output"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work")
+    assert backend.configure()
+    backend.flow.build_runner = FailingBuildRunner()
+
+    success, msg = await backend.build_async()
+
+    assert not success
+    assert "exited with an error: 2" in msg
+    assert msg.endswith("line 1\nerror: bad")
+
+
+@pytest.mark.asyncio
+async def test_build_async_no_stdin(tmp_path, fake_flow):
+    """Test that a build reading stdin sees EOF instead of hanging"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work")
+    assert backend.configure()
+    backend.flow.build_runner = StdinBuildRunner()
+
+    success, msg = await asyncio.wait_for(backend.build_async(), timeout=30)
+
+    assert success, msg
+    assert (tmp_path / "work" / BUILD_LOG_FILE).read_text() == "''\n"
+
+
+@pytest.mark.asyncio
+async def test_build_async_long_output_line(tmp_path, fake_flow):
+    """Test that an overlong output line does not fail the build"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work")
+    assert backend.configure()
+    backend.flow.build_runner = LongLineBuildRunner()
+
+    success, msg = await backend.build_async()
+
+    assert success, msg
+    log = (tmp_path / "work" / BUILD_LOG_FILE).read_text()
+    assert len(log) == 4 * 1024 * 1024 + len("\ndone\n")
+
+
+@pytest.mark.asyncio
+async def test_build_async_cancel_kills_build(tmp_path, fake_flow):
+    """Test that cancelling a build does not leave its process running"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work")
+    assert backend.configure()
+    backend.flow.build_runner = HangingBuildRunner()
+
+    task = asyncio.ensure_future(backend.build_async())
+    pid_file = tmp_path / "work" / "build.pid"
+    for _ in range(500):
+        if pid_file.exists() and pid_file.read_text():
+            break
+        await asyncio.sleep(0.01)
+    pid = int(pid_file.read_text())
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The process was killed and reaped
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_get_log_files(tmp_path, fake_flow):
+    """Test that log file listings reflect the current directory contents"""
+    work_root = tmp_path / "work"
+    backend = EdalizeBackend(fake_flow, {}, work_root)
+
+    (work_root / "build.log").write_text("")
+    (work_root / "timing.rpt").write_text("")
+    (work_root / "test.v").write_text("")
+
+    names = sorted(p.name for p in backend.get_log_files())
+    assert names == ["build.log", "timing.rpt"]
+
+    # Files added later are found; .log files come first
+    (work_root / "transcript").write_text("")
+    (work_root / "sim.log").write_text("")
+    names = [p.name for p in backend.get_log_files()]
+    assert names == ["build.log", "sim.log", "timing.rpt", "transcript"]
+
+
+def test_build_up_to_date(tmp_path, fake_flow):
+    """Test that the build manifest tracks source changes"""
+    src = tmp_path / "test.v"
+    src.write_text("module test; endmodule")
+
+    backend = EdalizeBackend(fake_flow, make_edam(src, tool='verilator'), tmp_path / "work")
+    assert backend.configure()
+    assert not backend.is_build_up_to_date()
+
+    success, _ = backend.build()
+    assert success
+    assert backend.is_build_up_to_date()
+
+    # Touching a source invalidates the build
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+    assert not backend.is_build_up_to_date()
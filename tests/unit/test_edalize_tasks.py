@@ -21,18 +21,67 @@ from pathlib import Path
 from dv_flow.mgr.task_data import TaskDataInput
 from dv_flow.libfusesoc.edalize_sim import (
     SimConfigure, SimConfigureParams,
-    SimBuild, SimBuildParams,
-    SimRun, SimRunParams
+    SimBuild, SimBuildParams
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_build_cache(tmp_path, monkeypatch):
+    """Keep SimBuild's artifact cache out of the real user cache"""
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / "xdg_cache"))
+
+
+@pytest.fixture(scope="session")
+def prebuilt_v_sources(tmp_path_factory):
+    """
+    Write the read-only Verilog sources used by these tests once.
+    Tests still run in their own tmp_path, so task outputs stay isolated.
+    """
+    root = tmp_path_factory.mktemp("v_sources")
+    
+    (root / "empty.v").write_text("module test; endmodule")
+    (root / "finish.v").write_text("module test; initial begin $finish; end endmodule")
+    (root / "display.v").write_text(
+        "module test; initial begin $display(\"PASS\"); $finish; end endmodule")
+    
+    (root / "include").mkdir()
+    (root / "include" / "defines.vh").write_text("`define TEST 1")
+    (root / "include_user.v").write_text('`include "defines.vh"\nmodule test; endmodule')
+    
+    return root
+
+
+def configure_icarus(tmp_path, source):
+    """Run SimConfigure for an Icarus design in tmp_path"""
+    files = [
+        {'path': str(source), 'type': 'verilog', 'name': 'test.v'}
+    ]
+    
+    config_params = SimConfigureParams(
+        core_name="test_design",
+        files=files,
+        toplevel="test",
+        tool="icarus"
+    )
+    
+    config_input = TaskDataInput(
+        name="SimConfigure",
+        changed=True,
+        srcdir=str(tmp_path),
+        rundir=str(tmp_path / "run"),
+        params=config_params,
+        inputs=[],
+        memento=None
+    )
+    
+    return SimConfigure(None, config_input)
+
+
 @pytest.mark.asyncio
-async def test_sim_configure_task(tmp_path):
+async def test_sim_configure_task(tmp_path, prebuilt_v_sources):
     """Test SimConfigure task"""
     
-    # Create some test files
-    test_file = tmp_path / "test.v"
-    test_file.write_text("module test; endmodule")
+    test_file = prebuilt_v_sources / "empty.v"
     
     files = [
         {'path': str(test_file), 'type': 'verilog', 'name': 'test.v'}
@@ -74,11 +123,10 @@ async def test_sim_configure_task(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_sim_configure_with_plusargs(tmp_path):
+async def test_sim_configure_with_plusargs(tmp_path, prebuilt_v_sources):
     """Test SimConfigure with plusargs"""
     
-    test_file = tmp_path / "test.v"
-    test_file.write_text("module test; endmodule")
+    test_file = prebuilt_v_sources / "empty.v"
     
     files = [
         {'path': str(test_file), 'type': 'verilog', 'name': 'test.v'}
@@ -109,16 +157,11 @@ async def test_sim_configure_with_plusargs(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_sim_configure_with_include_dirs(tmp_path):
+async def test_sim_configure_with_include_dirs(tmp_path, prebuilt_v_sources):
     """Test SimConfigure with include directories"""
     
-    # Create include directory
-    inc_dir = tmp_path / "include"
-    inc_dir.mkdir()
-    (inc_dir / "defines.vh").write_text("`define TEST 1")
-    
-    test_file = tmp_path / "test.v"
-    test_file.write_text('`include "defines.vh"\nmodule test; endmodule')
+    inc_dir = prebuilt_v_sources / "include"
+    test_file = prebuilt_v_sources / "include_user.v"
     
     files = [
         {'path': str(test_file), 'type': 'verilog', 'name': 'test.v'}
@@ -149,40 +192,15 @@ async def test_sim_configure_with_include_dirs(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_sim_build_task(tmp_path):
+async def test_sim_build_task(tmp_path, prebuilt_v_sources):
     """Test SimBuild task (after configuration)"""
     
     # First configure
-    test_file = tmp_path / "test.v"
-    test_file.write_text("module test; initial begin $display(\"PASS\"); $finish; end endmodule")
-    
-    files = [
-        {'path': str(test_file), 'type': 'verilog', 'name': 'test.v'}
-    ]
-    
-    config_params = SimConfigureParams(
-        core_name="test_design",
-        files=files,
-        toplevel="test",
-        tool="icarus"
-    )
-    
-    config_input = TaskDataInput(
-        name="SimConfigure",
-        changed=True,
-        srcdir=str(tmp_path),
-        rundir=str(tmp_path / "run"),
-        params=config_params,
-        inputs=[],
-        memento=None
-    )
-    
-    config_result = await SimConfigure(None, config_input)
+    config_result = await configure_icarus(tmp_path, prebuilt_v_sources / "display.v")
     assert config_result.status == 0
     
     work_root = config_result.output[0]['work_root']
     
-    # Now build
     build_params = SimBuildParams(
         work_root=work_root,
         tool="icarus"
@@ -211,56 +229,45 @@ async def test_sim_build_task(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_task_chain_configure_build(tmp_path):
+async def test_task_chain_configure_build(tmp_path, prebuilt_v_sources):
     """Test chaining SimConfigure -> SimBuild"""
     
-    test_file = tmp_path / "test.v"
-    test_file.write_text("module test; initial begin $finish; end endmodule")
+    # Configure
+    config_result = await configure_icarus(tmp_path, prebuilt_v_sources / "finish.v")
     
-    files = [
-        {'path': str(test_file), 'type': 'verilog', 'name': 'test.v'}
-    ]
+    assert config_result.status == 0, [m.msg for m in config_result.markers]
+    config_output = config_result.output[0]
+    assert config_output['configured'] == True
     
-    # Configure
-    config_params = SimConfigureParams(
-        core_name="test_design",
-        files=files,
-        toplevel="test",
-        tool="icarus"
+    # Build from the configure output
+    build_params = SimBuildParams(
+        work_root=config_output['work_root'],
+        tool=config_output['tool']
     )
     
-    config_input = TaskDataInput(
-        name="SimConfigure",
+    build_input = TaskDataInput(
+        name="SimBuild",
         changed=True,
         srcdir=str(tmp_path),
         rundir=str(tmp_path / "run"),
-        params=config_params,
-        inputs=[],
+        params=build_params,
+        inputs=[config_output],
         memento=None
     )
     
-    config_result = await SimConfigure(None, config_input)
-    
-    if config_result.status == 0:
-        # Build
-        work_root = config_result.output[0]['work_root']
-        
-        build_params = SimBuildParams(
-            work_root=work_root,
-            tool="icarus"
-        )
-        
-        build_input = TaskDataInput(
-            name="SimBuild",
-            changed=True,
-            srcdir=str(tmp_path),
-            rundir=str(tmp_path / "run"),
-            params=build_params,
-            inputs=[config_result.output[0]],
-            memento=None
-        )
-        
-        build_result = await SimBuild(None, build_input)
-        
-        # Verify the chain worked
-        assert build_result is not None
+    build_result = await SimBuild(None, build_input)
+    
+    # The build runs against the configured work_root and reports its
+    # outcome consistently (it fails if icarus isn't installed)
+    assert build_result.status in [0, 1]
+    assert len(build_result.output) == 1
+    
+    build_output = build_result.output[0]
+    assert build_output['work_root'] == config_output['work_root']
+    assert build_output['build_success'] == (build_result.status == 0)
+    
+    if build_result.status == 0:
+        assert build_output['executable'] is not None
+        assert Path(build_output['executable']).exists()
+    else:
+        assert any(m.msg.startswith("Build failed") for m in build_result.markers)
@@ -17,9 +17,16 @@
 #*
 #****************************************************************************
 import pytest
+from dv_flow.libfusesoc import edam_builder
 from dv_flow.libfusesoc.edam_builder import EdamBuilder, build_edam_from_core
 
 
+@pytest.fixture
+def builder():
+    """Fresh EdamBuilder with default settings"""
+    return EdamBuilder("test")
+
+
 def test_basic_edam_structure():
     """Test basic EDAM structure creation"""
     builder = EdamBuilder("test_design")
@@ -33,10 +40,8 @@ def test_basic_edam_structure():
     assert 'flow_options' in edam
 
 
-def test_add_files():
+def test_add_files(builder):
     """Test adding files to EDAM"""
-    builder = EdamBuilder("test")
-    
     files = [
         {'path': '/path/to/file1.v', 'type': 'verilog'},
         {'path': '/path/to/file2.sv', 'type': 'systemverilog'},
@@ -53,10 +58,26 @@ def test_add_files():
     assert edam['files'][2]['file_type'] == 'vhdlSource'
 
 
-def test_set_toplevel():
-    """Test setting toplevel module"""
-    builder = EdamBuilder("test")
+def test_add_files_deduplicates(builder):
+    """Test that duplicate files are only added once, in first-seen order"""
+    builder.add_files([
+        {'path': '/path/to/pkg.sv', 'type': 'systemverilog'},
+        {'path': '/path/to/top.sv', 'type': 'systemverilog'},
+    ])
+    builder.add_files([
+        {'path': '/path/to/pkg.sv', 'type': 'systemverilog'},
+        {'path': '/path/to/pkg.sv', 'type': 'systemverilog', 'library': 'lib'},
+    ])
+    edam = builder.build()
     
+    assert [f['name'] for f in edam['files']] == [
+        '/path/to/pkg.sv', '/path/to/top.sv', '/path/to/pkg.sv'
+    ]
+    assert edam['files'][2]['logical_name'] == 'lib'
+
+
+def test_set_toplevel(builder):
+    """Test setting toplevel module"""
     builder.set_toplevel("my_top")
     edam = builder.build()
     
@@ -70,10 +91,8 @@ def test_set_toplevel():
     assert edam2['toplevel'] == 'top1'
 
 
-def test_add_parameters():
+def test_add_parameters(builder):
     """Test adding parameters"""
-    builder = EdamBuilder("test")
-    
     params = {
         'WIDTH': 8,
         'ENABLE': True,
@@ -94,10 +113,23 @@ def test_add_parameters():
     assert edam['parameters']['NAME']['datatype'] == 'str'
 
 
-def test_add_plusargs():
+def test_infer_datatype(builder):
+    """Test datatype inference, including subclasses of builtin types"""
+    import enum
+    
+    class Mode(enum.IntEnum):
+        FAST = 1
+    
+    assert builder._infer_datatype(True) == 'bool'
+    assert builder._infer_datatype(8) == 'int'
+    assert builder._infer_datatype(1.5) == 'real'
+    assert builder._infer_datatype('x') == 'str'
+    assert builder._infer_datatype(Mode.FAST) == 'int'
+    assert builder._infer_datatype(None) == 'str'
+
+
+def test_add_plusargs(builder):
     """Test adding runtime plusargs"""
-    builder = EdamBuilder("test")
-    
     plusargs = {
         'seed': 42,
         'verbose': True,
@@ -114,10 +146,8 @@ def test_add_plusargs():
     assert edam['parameters']['verbose']['paramtype'] == 'plusarg'
 
 
-def test_set_tool_options():
+def test_set_tool_options(builder):
     """Test setting tool-specific options"""
-    builder = EdamBuilder("test")
-    
     builder.set_tool_options('icarus', {
         'iverilog_options': ['-g2012', '-Wall']
     })
@@ -128,10 +158,8 @@ def test_set_tool_options():
     assert edam['tool_options']['icarus']['iverilog_options'] == ['-g2012', '-Wall']
 
 
-def test_set_flow_options():
+def test_set_flow_options(builder):
     """Test setting flow-level options"""
-    builder = EdamBuilder("test")
-    
     builder.set_flow_options({
         'tool': 'verilator',
         'target': 'sim'
@@ -143,10 +171,36 @@ def test_set_flow_options():
     assert edam['flow_options']['target'] == 'sim'
 
 
-def test_add_include_dirs():
-    """Test adding include directories"""
-    builder = EdamBuilder("test")
+def test_verilator_accelerators(monkeypatch):
+    """Test that ccache/mold are wired into Verilator builds when found"""
+    monkeypatch.setattr(edam_builder, '_ACCELERATORS', {
+        'ccache': '/usr/bin/ccache',
+        'mold': '/usr/bin/mold',
+    })
     
+    edam = (EdamBuilder("test")
+            .set_flow_options({'tool': 'verilator'})
+            .build())
+    
+    options = edam['tool_options']['verilator']
+    assert 'VM_PARALLEL_BUILDS=1' in options['make_options']
+    assert 'OBJCACHE=/usr/bin/ccache' in options['make_options']
+    assert '-LDFLAGS -fuse-ld=mold' in options['verilator_options']
+    
+    # Accelerators can be disabled, and are not added for other tools
+    edam = (EdamBuilder("test", accelerate=False)
+            .set_flow_options({'tool': 'verilator'})
+            .build())
+    assert 'verilator' not in edam['tool_options']
+    
+    edam = (EdamBuilder("test")
+            .set_flow_options({'tool': 'icarus'})
+            .build())
+    assert 'verilator' not in edam['tool_options']
+
+
+def test_add_include_dirs(builder):
+    """Test adding include directories"""
     include_dirs = ['/path/to/inc1', '/path/to/inc2']
     builder.add_include_dirs(include_dirs)
     
@@ -161,10 +215,19 @@ def test_add_include_dirs():
     assert 'verilator_options' in edam['tool_options']['verilator']
 
 
-def test_file_attributes():
-    """Test that file attributes are properly converted"""
-    builder = EdamBuilder("test")
+def test_add_include_dirs_target_tool():
+    """Test that include dirs only populate the target tool's options"""
+    edam = (EdamBuilder("test", accelerate=False)
+            .add_include_dirs(['/path/to/inc'])
+            .set_flow_options({'tool': 'verilator'})
+            .build())
     
+    assert 'icarus' not in edam['tool_options']
+    assert edam['tool_options']['verilator']['verilator_options'] == ['-I/path/to/inc']
+
+
+def test_file_attributes(builder):
+    """Test that file attributes are properly converted"""
     files = [
         {
             'path': '/path/to/inc.vh',
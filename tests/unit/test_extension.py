@@ -17,13 +17,43 @@
 #*
 #****************************************************************************
 import os
-from pathlib import Path
+import pytest
 from dv_flow.libfusesoc.__ext__ import dvfm_packages
 
 
-def test_dvfm_packages_registration():
+@pytest.fixture(scope="session")
+def registered_packages():
+    """Packages registered by the extension, looked up once per session"""
+    return dvfm_packages()
+
+
+@pytest.fixture(scope="session")
+def flow_files(registered_packages):
+    """
+    Map each package name to (is_file, content) for its flow file.
+    Each containing directory is scanned once and each file read once.
+    """
+    listings = {}
+    for path in registered_packages.values():
+        directory = os.path.dirname(path)
+        if directory not in listings:
+            with os.scandir(directory) as it:
+                listings[directory] = {entry.name: entry.is_file() for entry in it}
+                
+    files = {}
+    for name, path in registered_packages.items():
+        is_file = listings[os.path.dirname(path)].get(os.path.basename(path))
+        content = None
+        if is_file:
+            with open(path) as fp:
+                content = fp.read()
+        files[name] = (is_file, content)
+    return files
+
+
+def test_dvfm_packages_registration(registered_packages, flow_files):
     """Test that dvfm_packages returns correct package definitions"""
-    packages = dvfm_packages()
+    packages = registered_packages
     
     # Verify expected packages are registered
     assert 'fusesoc' in packages
@@ -34,19 +64,16 @@ def test_dvfm_packages_registration():
     # Verify all paths point to .dv files
     for name, path in packages.items():
         assert path.endswith('.dv'), f"Package {name} should point to .dv file"
-        assert os.path.exists(path), f"Flow file {path} for {name} should exist"
+        assert flow_files[name][0] is not None, f"Flow file {path} for {name} should exist"
 
 
-def test_flow_files_exist():
+def test_flow_files_exist(registered_packages, flow_files):
     """Test that all registered flow definition files exist"""
-    packages = dvfm_packages()
-    
-    for name, path in packages.items():
-        file_path = Path(path)
-        assert file_path.exists(), f"Flow file for {name} does not exist: {path}"
-        assert file_path.is_file(), f"Flow path for {name} is not a file: {path}"
+    for name, path in registered_packages.items():
+        is_file, content = flow_files[name]
+        assert is_file is not None, f"Flow file for {name} does not exist: {path}"
+        assert is_file, f"Flow path for {name} is not a file: {path}"
         
         # Verify it's readable
-        content = file_path.read_text()
         assert len(content) > 0, f"Flow file for {name} is empty: {path}"
         assert 'package:' in content, f"Flow file for {name} should contain 'package:' section"
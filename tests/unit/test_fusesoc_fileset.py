@@ -16,20 +16,35 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import os
+import pytest
 from pathlib import Path
 from dv_flow.libfusesoc.fusesoc_fileset import FilesetConverter
 
 
-def test_file_type_mapping(tmp_path):
-    """Test that FuseSoC file types are mapped correctly"""
-    core_root = tmp_path / "core"
-    core_root.mkdir()
+@pytest.fixture(scope="module")
+def shared_converter(tmp_path_factory):
+    """
+    Converter over a core directory holding the common test files.
+    Only for tests that read existing files, since the files are shared
+    across the module.
+    """
+    core_root = tmp_path_factory.mktemp("core")
     
-    # Create test files
     (core_root / "test.v").write_text("module test; endmodule")
     (core_root / "test.sv").write_text("module test; endmodule")
+    (core_root / "test.vhd").write_text("library work;")
+    (core_root / "rtl").mkdir()
+    (core_root / "rtl" / "test.v").write_text("module test; endmodule")
+    (core_root / "include").mkdir()
+    (core_root / "include" / "defines.vh").write_text("`define TEST 1")
     
-    converter = FilesetConverter(core_root)
+    return FilesetConverter(core_root)
+
+
+def test_file_type_mapping(shared_converter):
+    """Test that FuseSoC file types are mapped correctly"""
+    converter = shared_converter
     
     fusesoc_files = [
         {'name': 'test.v', 'file_type': 'verilogSource'},
@@ -45,16 +60,20 @@ def test_file_type_mapping(tmp_path):
     assert converted[1]['name'] == 'test.sv'
 
 
-def test_file_path_resolution(tmp_path):
-    """Test that file paths are resolved correctly"""
-    core_root = tmp_path / "core"
-    core_root.mkdir()
+def test_non_string_file_type(shared_converter):
+    """Test that a missing or non-string file type is passed through"""
+    converted = shared_converter.convert_files([
+        {'name': 'test.v', 'file_type': None},
+        {'name': 'test.sv'},
+    ])
     
-    test_file = core_root / "rtl" / "test.v"
-    test_file.parent.mkdir(parents=True)
-    test_file.write_text("module test; endmodule")
-    
-    converter = FilesetConverter(core_root)
+    assert converted[0]['type'] is None
+    assert converted[1]['type'] == 'user'
+
+
+def test_file_path_resolution(shared_converter):
+    """Test that file paths are resolved correctly"""
+    converter = shared_converter
     
     fusesoc_files = [
         {'name': 'rtl/test.v', 'file_type': 'verilogSource'},
@@ -63,20 +82,14 @@ def test_file_path_resolution(tmp_path):
     converted = converter.convert_files(fusesoc_files)
     
     assert len(converted) == 1
-    assert Path(converted[0]['path']).exists()
-    assert Path(converted[0]['path']).is_absolute()
+    assert converted[0]['exists']
+    assert os.path.isabs(converted[0]['path'])
     assert converted[0]['path'].endswith('rtl/test.v')
 
 
-def test_include_file_handling(tmp_path):
+def test_include_file_handling(shared_converter):
     """Test handling of include files and directories"""
-    core_root = tmp_path / "core"
-    inc_dir = core_root / "include"
-    inc_dir.mkdir(parents=True)
-    
-    (inc_dir / "defines.vh").write_text("`define TEST 1")
-    
-    converter = FilesetConverter(core_root)
+    converter = shared_converter
     
     fusesoc_files = [
         {
@@ -95,14 +108,9 @@ def test_include_file_handling(tmp_path):
     assert 'include' in include_dirs[0]
 
 
-def test_logical_name_mapping(tmp_path):
+def test_logical_name_mapping(shared_converter):
     """Test that VHDL logical names are converted to library attribute"""
-    core_root = tmp_path / "core"
-    core_root.mkdir()
-    
-    (core_root / "test.vhd").write_text("library work;")
-    
-    converter = FilesetConverter(core_root)
+    converter = shared_converter
     
     fusesoc_files = [
         {
@@ -118,12 +126,9 @@ def test_logical_name_mapping(tmp_path):
     assert converted[0]['library'] == 'work'
 
 
-def test_filter_by_type(tmp_path):
+def test_filter_by_type(shared_converter):
     """Test filtering files by type"""
-    core_root = tmp_path / "core"
-    core_root.mkdir()
-    
-    converter = FilesetConverter(core_root)
+    converter = shared_converter
     
     files = [
         {'path': 'test.v', 'type': 'verilog', 'name': 'test.v'},
@@ -161,5 +166,123 @@ def test_files_root_separation(tmp_path):
     converted = converter.convert_files(fusesoc_files)
     
     assert len(converted) == 1
-    assert Path(converted[0]['path']).exists()
+    assert converted[0]['exists']
     assert 'fetched.v' in converted[0]['path']
+
+
+def test_reused_converter_sees_new_files(tmp_path):
+    """Test that a reused converter picks up files created since its last run"""
+    core_root = tmp_path / "core"
+    files_root = tmp_path / "fetched"
+    core_root.mkdir()
+    files_root.mkdir()
+    
+    converter = FilesetConverter(core_root, files_root)
+    fusesoc_files = [{'name': 'gen.v', 'file_type': 'verilogSource'}]
+    
+    first = converter.convert_files(fusesoc_files)
+    assert not first[0]['exists']
+    
+    # The file is generated between resolutions
+    (files_root / "gen.v").write_text("module gen; endmodule")
+    second = converter.convert_files(fusesoc_files)
+    
+    assert second[0]['exists']
+    assert second[0]['path'] == str((files_root / "gen.v").resolve())
+
+
+def test_convert_and_extract(tmp_path):
+    """Test that the single-pass conversion matches the separate calls"""
+    core_root = tmp_path / "core"
+    inc_dir = core_root / "include"
+    inc_dir.mkdir(parents=True)
+    
+    (core_root / "test.v").write_text("module test; endmodule")
+    (inc_dir / "defines.vh").write_text("`define TEST 1")
+    
+    fusesoc_files = [
+        {'name': 'test.v', 'file_type': 'verilogSource', 'include_path': 'include'},
+        {
+            'name': 'include/defines.vh',
+            'file_type': 'verilogSource',
+            'is_include_file': True
+        },
+    ]
+    
+    converted, include_dirs = FilesetConverter(core_root).convert_and_extract(fusesoc_files)
+    
+    converter = FilesetConverter(core_root)
+    assert converted == converter.convert_files(fusesoc_files)
+    assert include_dirs == converter.extract_include_dirs(fusesoc_files)
+    assert len(include_dirs) == 1
+
+
+def test_directory_listed_once(tmp_path, monkeypatch):
+    """Test that files sharing a directory are checked with one scan"""
+    core_root = tmp_path / "core"
+    rtl_dir = core_root / "rtl"
+    rtl_dir.mkdir(parents=True)
+    
+    names = [f"rtl/mod{i}.v" for i in range(4)]
+    for name in names:
+        (core_root / name).write_text("module m; endmodule")
+        
+    scanned = []
+    real_scandir = os.scandir
+    
+    def counting_scandir(path):
+        scanned.append(path)
+        return real_scandir(path)
+        
+    monkeypatch.setattr(os, 'scandir', counting_scandir)
+    
+    converter = FilesetConverter(core_root)
+    converted = converter.convert_files(
+        [{'name': name, 'file_type': 'verilogSource'} for name in names])
+    
+    assert len(converted) == 4
+    assert all(Path(f['path']).exists() for f in converted)
+    assert scanned == [str(rtl_dir)]
+
+
+def test_include_dirs_follow_list_changes(shared_converter):
+    """Test that include dirs reflect the list as it is when extracted"""
+    converter = shared_converter
+    
+    fusesoc_files = [
+        {'name': 'include/defines.vh', 'file_type': 'verilogSource', 'is_include_file': True},
+    ]
+    converter.convert_files(fusesoc_files)
+    
+    # Changing the list in place after conversion must not be missed
+    fusesoc_files.append(
+        {'name': 'rtl/test.v', 'file_type': 'verilogSource', 'is_include_file': True})
+    include_dirs = converter.extract_include_dirs(fusesoc_files)
+    
+    assert len(include_dirs) == 2
+    assert any(d.endswith('include') for d in include_dirs)
+    assert any(d.endswith('rtl') for d in include_dirs)
+
+
+def test_resolution_follows_symlinks(tmp_path):
+    """Test that cached parent resolution still canonicalizes symlinks"""
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    (real_dir / "test.v").write_text("module test; endmodule")
+    
+    core_root = tmp_path / "core"
+    core_root.mkdir()
+    (core_root / "rtl").symlink_to(real_dir)
+    (core_root / "linked.v").symlink_to(real_dir / "test.v")
+    
+    converter = FilesetConverter(core_root)
+    converted = converter.convert_files([
+        {'name': 'rtl/test.v', 'file_type': 'verilogSource'},
+        {'name': 'linked.v', 'file_type': 'verilogSource'},
+        {'name': 'rtl/generated.v', 'file_type': 'verilogSource'},
+    ])
+    
+    assert converted[0]['path'] == os.path.realpath(real_dir / "test.v")
+    assert converted[1]['path'] == os.path.realpath(real_dir / "test.v")
+    assert converted[2]['path'] == os.path.join(os.path.realpath(real_dir), "generated.v")
+    assert [f['exists'] for f in converted] == [True, True, False]
@@ -16,10 +16,19 @@
 #* limitations under the License.
 #*
 #****************************************************************************
+import copy
 import os
 import pytest
 from pathlib import Path
-from dv_flow.libfusesoc.fusesoc_manager import FuseSoCManager
+from dv_flow.libfusesoc import fusesoc_manager
+from dv_flow.libfusesoc.fusesoc_manager import FuseSoCManager, get_manager
+
+
+# Standard FuseSoC data and config locations of the user installation
+_GLOBAL_FUSESOC_PREFIXES = (
+    Path.home() / ".local" / "share" / "fusesoc",
+    Path.home() / ".config" / "fusesoc",
+)
 
 
 def test_isolated_workspace_creation(isolated_fusesoc_workspace):
@@ -58,6 +67,17 @@ def test_fusesoc_manager_isolated(isolated_fusesoc_workspace):
     assert manager.data_dir == workspace.data_dir
 
 
+def test_get_manager_cached(isolated_fusesoc_workspace):
+    """Test that managers are shared across identical requests"""
+    workspace = str(isolated_fusesoc_workspace.workspace)
+    get_manager.cache_clear()
+    
+    manager = get_manager(workspace, ())
+    
+    assert get_manager(workspace, ()) is manager
+    assert get_manager(workspace + "_other", ()) is not manager
+
+
 def test_add_test_core(isolated_fusesoc_workspace, test_cores_dir):
     """Test adding a test core to isolated workspace"""
     workspace = isolated_fusesoc_workspace
@@ -89,14 +109,50 @@ def test_no_global_contamination(isolated_fusesoc_workspace):
     workspace = isolated_fusesoc_workspace
     
     # Check that standard FuseSoC directories are NOT being used
-    home = Path.home()
-    global_fusesoc_data = home / ".local" / "share" / "fusesoc"
-    global_fusesoc_config = home / ".config" / "fusesoc"
+    global_fusesoc_data, global_fusesoc_config = _GLOBAL_FUSESOC_PREFIXES
     
     # Verify our workspace is NOT in global locations
     assert not workspace.workspace.is_relative_to(global_fusesoc_data)
     assert not workspace.config_dir.is_relative_to(global_fusesoc_config)
     
     # Verify environment points to test directories, not global ones
-    assert str(global_fusesoc_data) not in os.environ.get('XDG_DATA_HOME', '')
-    assert str(global_fusesoc_config) not in os.environ.get('XDG_CONFIG_HOME', '')
+    assert not Path(os.environ['XDG_DATA_HOME']).is_relative_to(global_fusesoc_data)
+    assert not Path(os.environ['XDG_CONFIG_HOME']).is_relative_to(global_fusesoc_config)
+
+
+class FakeCore:
+    """Stand-in for a resolved FuseSoC core"""
+    
+    name = 'test:cores:simple:1.0'
+    core_root = '/cores/simple'
+    files_root = '/cores/simple'
+    
+    def get_files(self, flags):
+        return [{'name': 'simple.v', 'file_type': 'verilogSource', 'tags': ['rtl']}]
+        
+    def get_depends(self, flags):
+        return ['test:cores:dep:1.0']
+        
+    def get_parameters(self, flags):
+        return {'WIDTH': {'datatype': 'int', 'default': 8}}
+
+
+def test_core_files_returned_as_copies(isolated_fusesoc_workspace, monkeypatch):
+    """Test that changing a returned file list leaves the cached one intact"""
+    # Only the result caches are exercised, not FuseSoC's library handling
+    monkeypatch.setattr(fusesoc_manager, 'LibraryManager', lambda config: None)
+    manager = FuseSoCManager(config_dir=isolated_fusesoc_workspace.config_dir)
+    core = FakeCore()
+    
+    first = manager.get_core_files(core)
+    expected = copy.deepcopy({k: first[k] for k in ('files', 'dependencies', 'parameters')})
+    
+    first['files'][0]['tags'].append('changed')
+    first['files'].clear()
+    first['dependencies'].append('test:cores:other:1.0')
+    first['parameters']['WIDTH']['default'] = 16
+    manager.get_dependencies(core).clear()
+    
+    second = manager.get_core_files(core)
+    assert {k: second[k] for k in expected} == expected
+    assert manager.get_dependencies(core) == ['test:cores:dep:1.0']